@@ -1,11 +1,10 @@
-"""Entry point: python -m examiner [exam_file]."""
+"""Entry point: python -m examiner [exam_file] | python -m examiner grade|stats ..."""
 
 from __future__ import annotations
 
 import sys
 from pathlib import Path
 
-from .app import ExaminerApp
 from .loader import discover_exams, load_exam
 
 # Exam directory relative to this package
@@ -13,6 +12,14 @@ _EXAMS_DIR = Path(__file__).parent / "exams"
 
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "grade":
+        # Headless mode — never imports Textual
+        from .grade import main as grade_main
+        sys.exit(grade_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        from .journal import main as stats_main
+        sys.exit(stats_main(sys.argv[2:]))
+
     if len(sys.argv) > 1:
         exam_path = Path(sys.argv[1])
     else:
@@ -25,6 +32,9 @@ def main() -> None:
         print(f"Loading: {exams[0]['title']}")
 
     exam = load_exam(exam_path)
+
+    from .app import ExaminerApp
+
     app = ExaminerApp(exam)
     app.run()
 
@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import os
+import sqlite3
+
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal
+from textual.message import Message
 from textual.widgets import Footer, Header, Static
+from textual.worker import Worker
 from textual import work
 
-from .exporter import export_grade_report
+from .journal import Journal, enabled as journal_enabled
 from .models import Exam
+from .verification.cache import ResultCache
 from .verification.runner import VerificationRunner
 from .verification.ssh import SSHConnectionPool
 from .widgets.task_detail import TaskDetailWidget
 from .widgets.task_list import TaskListWidget
 from .widgets.timer import TimerWidget
+from .widgets.timing_panel import TimingPanel
 
 
 class ExaminerApp(App):
@@ -23,13 +30,26 @@ class ExaminerApp(App):
     CSS_PATH = "app.tcss"
     TITLE = "Ansible Examiner"
 
+    # Coalesce result updates to at most one repaint per frame
+    UPDATE_INTERVAL = 1 / 60
+
+    class CheckUpdated(Message):
+        """Fired when a check's result changes."""
+        def __init__(self, task_id: str, check_id: str) -> None:
+            super().__init__()
+            self.task_id = task_id
+            self.check_id = check_id
+
     BINDINGS = [
         Binding("v", "verify_current", "Verify Task"),
         Binding("V", "verify_all", "Verify All", key_display="shift+v"),
+        Binding("F", "force_verify_all", "Force Verify", key_display="shift+f", show=False),
         Binding("r", "reset_current", "Reset Task"),
         Binding("R", "reset_all", "Reset All", key_display="shift+r"),
         Binding("t", "toggle_timer", "Timer"),
+        Binding("w", "toggle_watch", "Watch"),
         Binding("c", "check_connectivity", "Connectivity"),
+        Binding("p", "toggle_timing", "Timing"),
         Binding("e", "export_report", "Export"),
         Binding("q", "quit", "Quit"),
     ]
@@ -38,8 +58,24 @@ class ExaminerApp(App):
         super().__init__()
         self.exam = exam
         self.pool = SSHConnectionPool()
-        self.runner = VerificationRunner(self.pool, exam)
+        cache = (
+            ResultCache.for_exam(exam.id)
+            if os.environ.get("EXAMINER_RESULT_CACHE", "1") != "0"
+            else None
+        )
+        self.runner = VerificationRunner(self.pool, exam, cache=cache)
+        self.journal: Journal | None = None
+        self._restored = 0
+        if journal_enabled():
+            try:
+                self.journal = Journal(exam)
+                self._restored = self.journal.restore()
+            except (OSError, sqlite3.Error):
+                self.journal = None
         self._current_task_id: str | None = None
+        self._dirty: dict[str, set[str]] = {}
+        self._flush_scheduled = False
+        self._watch_worker: Worker | None = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -54,6 +90,7 @@ class ExaminerApp(App):
             TaskDetailWidget(self.exam, id="task-detail"),
             id="main-content",
         )
+        yield TimingPanel(self.exam, id="timing-panel")
         yield Footer()
 
     def on_mount(self) -> None:
@@ -63,6 +100,12 @@ class ExaminerApp(App):
             self.query_one(TaskDetailWidget).show_task(first.id)
         timer = self.query_one(TimerWidget)
         timer.start()
+        if self._restored:
+            self.notify(
+                f"Restored {self._restored} results from your last session "
+                "— shift+r starts a new attempt"
+            )
+        self._run_warm_up()
 
     # ── Task navigation ──
 
@@ -94,19 +137,41 @@ class ExaminerApp(App):
     def action_verify_all(self) -> None:
         self._run_verify_all()
 
+    def action_force_verify_all(self) -> None:
+        self._run_verify_all(force=True)
+
     def action_reset_current(self) -> None:
         task = self._find_task(self._current_task_id)
         if task:
             self.runner.reset_task(task)
+            if self.journal is not None:
+                for check, result in zip(task.checks, task.results):
+                    self.journal.record(task, check, result)
             self._refresh_ui()
 
     def action_reset_all(self) -> None:
         self.runner.reset_all()
+        if self.journal is not None:
+            self.journal.new_attempt()
         self._refresh_ui()
 
     def action_toggle_timer(self) -> None:
         self.query_one(TimerWidget).toggle()
 
+    def action_toggle_timing(self) -> None:
+        panel = self.query_one(TimingPanel)
+        panel.display = not panel.display
+        panel.refresh_timings()
+
+    def action_toggle_watch(self) -> None:
+        if self._watch_worker is not None and self._watch_worker.is_running:
+            self._watch_worker.cancel()
+            self._watch_worker = None
+            self.sub_title = ""
+            self.notify("Watch mode off")
+        else:
+            self._watch_worker = self._run_watch()
+
     def action_check_connectivity(self) -> None:
         self._run_connectivity_check()
 
@@ -121,39 +186,68 @@ class ExaminerApp(App):
         if task is None:
             return
         self.notify(f"Verifying: {task.title}...")
-        await self.runner.verify_task(task)
-        self._refresh_ui()
+        await self.runner.verify_task(task, on_result=self._on_check_result)
+        # Every result already queued a CheckUpdated for _flush_updates to
+        # repaint; only the score needs to be current for the notification
+        self._refresh_score()
         status = task.status.value
         self.notify(f"Task {task.id}: {status}")
 
     @work(exclusive=True, group="verify")
-    async def _run_verify_all(self) -> None:
-        self.notify("Verifying all tasks...")
-        for task in self.exam.tasks:
-            await self.runner.verify_task(task)
-            self._refresh_ui()
+    async def _run_verify_all(self, force: bool = False) -> None:
+        self.notify("Re-running all checks..." if force else "Verifying all tasks...")
+        await self.runner.verify_all(on_result=self._on_check_result, force=force)
+        self._refresh_score()
         pct = self.exam.score_percent
         self.notify(f"Verification complete — Score: {pct:.0f}%")
 
+    @work(exclusive=True, group="warm-up")
+    async def _run_warm_up(self) -> None:
+        """Open connections to every VM in the background at startup."""
+        failed = [
+            name
+            async for name, ok, _ in self.pool.warm_up(self.exam.hosts)
+            if not ok
+        ]
+        if failed:
+            self.notify(
+                f"Unreachable: {', '.join(failed)} — press c for details",
+                severity="warning",
+            )
+
+    @work(exclusive=True, group="watch")
+    async def _run_watch(self) -> None:
+        """Re-verify checks whenever the files they depend on change."""
+        from .verification.watch import ExamWatcher
+
+        watcher = ExamWatcher(self.runner, on_result=self._on_check_result)
+        if not watcher.targets:
+            self.notify("No checks to watch", severity="warning")
+            return
+        self.sub_title = "Watching for changes"
+        self.notify(f"Watch mode on — {watcher.check_count} checks re-verify as files change")
+        try:
+            await watcher.run()
+        finally:
+            self.sub_title = ""
+
     @work(exclusive=True, group="verify")
     async def _run_connectivity_check(self) -> None:
         self.notify("Testing VM connectivity...")
-        results = []
-        for name, host in self.exam.hosts.items():
-            ok, msg = await self.pool.test_connectivity(name, host.ip, host.ssh_user)
-            status = "[green]OK[/]" if ok else "[red]FAIL[/]"
-            results.append(f"{status} {name} ({host.ip}): {msg}")
-        # Show results in the detail panel via the results log
-        detail = self.query_one(TaskDetailWidget)
-        log = detail.query_one("#results-log")
-        log.clear()
+        # Stream results into the detail panel's results log as they arrive
+        log = self.query_one(TaskDetailWidget).show_log()
         log.write("[bold]VM Connectivity Check[/]\n")
-        for line in results:
-            log.write(line)
+        async for name, ok, msg in self.pool.warm_up(self.exam.hosts):
+            host = self.exam.hosts[name]
+            status = "[green]OK[/]" if ok else "[red]FAIL[/]"
+            log.write(f"{status} {name} ({host.ip}): {msg}")
         self.notify("Connectivity check complete")
 
     @work(exclusive=True, group="export")
     async def _run_export(self) -> None:
+        # Loaded on first export; nothing else needs it
+        from .exporter import export_grade_report
+
         self.notify("Exporting grade report...")
         try:
             path = await export_grade_report(self.exam, self.pool)
@@ -164,17 +258,38 @@ class ExaminerApp(App):
     # ── Helpers ──
 
     def _find_task(self, task_id: str | None):
-        if task_id is None:
-            return None
-        for t in self.exam.tasks:
-            if t.id == task_id:
-                return t
-        return None
+        return self.exam.get_task(task_id)
+
+    def _on_check_result(self, task, check, result) -> None:
+        if self.journal is not None:
+            self.journal.record(task, check, result)
+        self.post_message(self.CheckUpdated(task.id, check.id))
+
+    def on_examiner_app_check_updated(self, event: CheckUpdated) -> None:
+        self._dirty.setdefault(event.task_id, set()).add(event.check_id)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.set_timer(self.UPDATE_INTERVAL, self._flush_updates)
+
+    def _flush_updates(self) -> None:
+        """Repaint only the list items, result lines and score that changed."""
+        self._flush_scheduled = False
+        dirty, self._dirty = self._dirty, {}
+        task_list = self.query_one(TaskListWidget)
+        detail = self.query_one(TaskDetailWidget)
+        for task_id, check_ids in dirty.items():
+            task_list.refresh_task(task_id)
+            detail.refresh_checks(task_id, check_ids)
+        self._refresh_score()
+        self.query_one(TimingPanel).refresh_timings()
 
     def _refresh_ui(self) -> None:
         self.query_one(TaskListWidget).refresh_statuses()
         self.query_one(TaskDetailWidget).refresh_current()
         self._refresh_score()
+        self.query_one(TimingPanel).refresh_timings()
 
     async def on_unmount(self) -> None:
         await self.pool.close_all()
+        if self.journal is not None:
+            self.journal.close()
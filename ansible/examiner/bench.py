@@ -0,0 +1,290 @@
+"""End-to-end verifier benchmark against local stand-in SSH servers.
+
+    python -m examiner.bench [exam.yml ...] [--latency MS] [--json out.json]
+                             [--baseline earlier.json] [--jump HOST]
+
+Starts one asyncssh server per exam host (control, node1..5, ...) on its own
+loopback address (127.0.0.x, Linux), all on one port, and replays each exam
+through VerificationRunner, SSHConnectionPool and export_grade_report.
+Commands run in local bash as the current user, after an optional per-command
+delay that stands in for network and VM latency. With ``--jump`` every
+other host is reached through that host's connection. For each exam it reports
+wall time, SSH connections and exec round trips seen by the servers, and
+peak Python memory, so scheduling and pooling changes can be compared with a
+saved baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import asyncssh
+
+from .environments import apply_overlay
+from .exporter import export_grade_report
+from .loader import load_exam
+from .verification.runner import VerificationRunner
+from .verification.ssh import SSHConnectionPool
+
+_EXAMS_DIR = Path(__file__).parent / "exams"
+
+# Stand-in VMs live at 127.0.0.<_FIRST_OCTET + n>
+_FIRST_OCTET = 10
+
+
+@dataclass
+class ServerStats:
+    """What the stand-in servers saw during one exam."""
+    connections: int = 0
+    round_trips: int = 0  # exec requests plus SFTP sessions
+
+
+@dataclass
+class BenchResult:
+    exam: str
+    checks: int
+    wall: float
+    connections: int
+    round_trips: int
+    peak_kib: float  # above what was already allocated when the exam started
+    report_bytes: int
+
+
+class _BenchServer(asyncssh.SSHServer):
+    """Accepts the examiner's password fallback (vagrant/vagrant)."""
+
+    def __init__(self, stats: ServerStats) -> None:
+        self._stats = stats
+
+    def connection_made(self, conn: asyncssh.SSHServerConnection) -> None:
+        self._stats.connections += 1
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return password == "vagrant"
+
+    def connection_requested(
+        self, dest_host: str, dest_port: int, orig_host: str, orig_port: int
+    ) -> bool:
+        return True  # lets --jump tunnel to the other servers
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StandInLab:
+    """A set of local SSH servers, one per host name, sharing one port."""
+
+    def __init__(
+        self,
+        names: list[str],
+        latency: float = 0.0,
+        port: int | None = None,
+        jump: str | None = None,
+    ) -> None:
+        self.port = port or _free_port()
+        self.latency = latency
+        self.jump = jump
+        self.stats = ServerStats()
+        self.addresses = {
+            name: f"127.0.0.{_FIRST_OCTET + i}" for i, name in enumerate(sorted(names))
+        }
+        self._servers: list[asyncssh.SSHAcceptor] = []
+        self._workdir = tempfile.TemporaryDirectory(prefix="examiner-bench-")
+
+    async def _handle(self, process: asyncssh.SSHServerProcess) -> None:
+        self.stats.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        proc = await asyncio.create_subprocess_exec(
+            "bash", "-c", process.command or "true",
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self._workdir.name,
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = await proc.communicate()
+            process.stdout.write(stdout)
+            process.stderr.write(stderr)
+            process.exit(proc.returncode if proc.returncode >= 0 else 128 - proc.returncode)
+        except (asyncssh.Error, OSError):
+            # Client gave up (timeout or closed channel) — don't leave strays
+            if proc.returncode is None:
+                proc.kill()
+            process.close()
+
+    def _sftp_session(self, chan: asyncssh.SSHServerChannel) -> asyncssh.SFTPServer:
+        self.stats.round_trips += 1
+        return asyncssh.SFTPServer(chan)
+
+    async def start(self) -> None:
+        host_key = asyncssh.generate_private_key("ssh-ed25519")
+        for address in self.addresses.values():
+            self._servers.append(await asyncssh.create_server(
+                lambda: _BenchServer(self.stats),
+                address,
+                self.port,
+                server_host_keys=[host_key],
+                process_factory=self._handle,
+                sftp_factory=self._sftp_session,
+                encoding=None,
+            ))
+
+    def overlay(self) -> dict:
+        """Environment overlay pointing exam hosts at the stand-in servers."""
+        hosts: dict[str, dict] = {}
+        for name, address in self.addresses.items():
+            hosts[name] = {"ip": address, "ssh_user": "vagrant"}
+            if self.jump is not None and name != self.jump:
+                hosts[name]["jump"] = self.jump
+        return {"hosts": hosts}
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._workdir.cleanup()
+
+
+async def bench_exam(lab: StandInLab, path: Path, report_dir: Path) -> BenchResult:
+    """Load, verify and export one exam, measuring the whole pass."""
+    lab.stats.connections = lab.stats.round_trips = 0
+    tracemalloc.reset_peak()
+    retained, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    exam = apply_overlay(load_exam(path), lab.overlay())
+    pool = SSHConnectionPool(port=lab.port)
+    try:
+        await VerificationRunner(pool, exam).verify_all()
+        report = await export_grade_report(exam, pool, trace=False, directory=report_dir)
+    finally:
+        await pool.close_all()
+
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return BenchResult(
+        exam=exam.id,
+        checks=sum(len(task.checks) for task in exam.tasks),
+        wall=wall,
+        connections=lab.stats.connections,
+        round_trips=lab.stats.round_trips,
+        peak_kib=(peak - retained) / 1024,
+        report_bytes=report.stat().st_size,
+    )
+
+
+async def run_bench(
+    paths: list[Path], latency: float, port: int | None, jump: str | None = None
+) -> list[BenchResult]:
+    names = sorted({name for path in paths for name in load_exam(path).hosts})
+    lab = StandInLab(names, latency=latency, port=port, jump=jump)
+    await lab.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="examiner-reports-") as report_dir:
+            for path in paths:
+                results.append(await bench_exam(lab, path, Path(report_dir)))
+    finally:
+        await lab.close()
+    return results
+
+
+def _format_table(results: list[BenchResult], baseline: dict[str, dict]) -> str:
+    lines = [
+        f"{'exam':<40} {'checks':>6} {'wall s':>8} {'conns':>6} {'rtts':>6} {'peak KiB':>9}"
+    ]
+    for r in results:
+        line = (
+            f"{r.exam:<40} {r.checks:>6} {r.wall:>8.3f} {r.connections:>6} "
+            f"{r.round_trips:>6} {r.peak_kib:>9.0f}"
+        )
+        base = baseline.get(r.exam)
+        if base and base.get("wall"):
+            line += (
+                f"   {(r.wall / base['wall'] - 1) * 100:+.0f}% wall,"
+                f" {r.round_trips - base['round_trips']:+d} rtts"
+            )
+        lines.append(line)
+    total = sum(r.wall for r in results)
+    lines.append(
+        f"{'total':<40} {sum(r.checks for r in results):>6} {total:>8.3f} "
+        f"{sum(r.connections for r in results):>6} {sum(r.round_trips for r in results):>6}"
+    )
+    return "\n".join(lines)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m examiner.bench",
+        description="Benchmark verification against local stand-in SSH servers.",
+    )
+    parser.add_argument(
+        "exams", nargs="*", type=Path,
+        help="exam YAML files (default: every exam in examiner/exams/)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="milliseconds added to every command on the servers (default: 0)",
+    )
+    parser.add_argument("--port", type=int, help="server port (default: any free port)")
+    parser.add_argument(
+        "--jump", metavar="HOST",
+        help="reach every other host through this host's connection (e.g. control)",
+    )
+    parser.add_argument("--json", type=Path, help="also write results to this JSON file")
+    parser.add_argument(
+        "--baseline", type=Path,
+        help="JSON from an earlier --json run to compare against",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    paths = args.exams or sorted(_EXAMS_DIR.glob("*.yml"))
+    if not paths:
+        print("No exam files found", file=sys.stderr)
+        return 2
+
+    baseline: dict[str, dict] = {}
+    if args.baseline:
+        baseline = {r["exam"]: r for r in json.loads(args.baseline.read_text())["results"]}
+
+    # Never pick up real Vagrant keys; the servers only take the password
+    os.environ["EXAMINER_VAGRANT_DIR"] = tempfile.gettempdir()
+    tracemalloc.start()
+    results = asyncio.run(run_bench(paths, args.latency / 1000, args.port, args.jump))
+    tracemalloc.stop()
+
+    print(_format_table(results, baseline))
+    if args.json:
+        args.json.write_text(json.dumps({
+            "latency_ms": args.latency,
+            "results": [asdict(r) for r in results],
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Startup benchmark — import cost and time to first frame.
+
+    python -m examiner.bench_startup [exam.yml] [--runs N] [--json out.json]
+                                     [--baseline earlier.json]
+                                     [--import-budget MS] [--frame-budget MS]
+
+Replays what ``python -m examiner`` does before the TUI is usable, each run
+in a fresh interpreter: load the exam, import the app, and (when Textual is
+installed) run it headless until the first frame is drawn. Imports are
+profiled with ``python -X importtime`` and summed per top-level package.
+The fastest of ``--runs`` runs is kept. Modules in ``DEFERRED`` must not be
+imported at startup at all — they load on first connection, first parse,
+first export or first watch — and the run fails if one is.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+_EXAMS_DIR = Path(__file__).parent / "exams"
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on demand, never before the first frame
+DEFERRED = (
+    "asyncssh",
+    "cryptography",
+    "yaml",
+    "examiner.exporter",
+    "examiner.verification.watch",
+)
+
+# Run in the child: the startup path of __main__, then either exit (import
+# profile) or run the app headless and report when the first frame is up
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+from examiner.loader import load_exam
+exam = load_exam(sys.argv[1])
+try:
+    from examiner.app import ExaminerApp
+except ImportError as e:
+    print("no-app", e.name, flush=True)
+    raise SystemExit(0)
+if sys.argv[2] == "frame":
+    import asyncio
+    async def first_frame():
+        app = ExaminerApp(exam)
+        async with app.run_test(headless=True, size=(120, 40)) as pilot:
+            await pilot.pause()
+            print("frame", time.perf_counter() - started, flush=True)
+            app.exit()
+    asyncio.run(first_frame())
+"""
+
+_FRAME_TIMEOUT = 60
+
+
+@dataclass
+class StartupResult:
+    exam: str
+    import_ms: float  # every import made on the way to the first frame
+    modules: int
+    packages: dict[str, float] = field(default_factory=dict)  # ms per top-level package
+    frame_ms: float | None = None  # process start to first frame; None without Textual
+    eager: list[str] = field(default_factory=list)  # DEFERRED modules imported anyway
+
+
+def _env(data_dir: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(_PACKAGE_ROOT), env.get("PYTHONPATH")) if p
+    )
+    # A throwaway journal and no real Vagrant keys
+    env["EXAMINER_DATA_DIR"] = data_dir
+    env["EXAMINER_VAGRANT_DIR"] = data_dir
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int]]:
+    """``(module, self_us)`` per ``-X importtime`` line, in import order."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+def _profile_imports(exam: Path, env: dict[str, str]) -> tuple[list[tuple[str, int]], bool]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, str(exam), "imports"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr), not proc.stdout.startswith("no-app")
+
+
+def _time_first_frame(exam: Path, env: dict[str, str]) -> float:
+    """Seconds from spawning the interpreter to the first frame."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _PROBE, str(exam), "frame"],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        line = proc.stdout.readline()
+        elapsed = time.perf_counter() - started
+        if not line.startswith("frame"):
+            raise RuntimeError(f"app exited before its first frame: {line.strip()!r}")
+        return elapsed
+    finally:
+        try:
+            proc.wait(timeout=_FRAME_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def measure(exam: Path, runs: int) -> StartupResult:
+    with tempfile.TemporaryDirectory(prefix="examiner-startup-") as data_dir:
+        env = _env(data_dir)
+        # Unmeasured: fills the exam snapshot cache like any earlier launch would
+        _profile_imports(exam, env)
+        best: list[tuple[str, int]] | None = None
+        has_app = False
+        for _ in range(runs):
+            modules, has_app = _profile_imports(exam, env)
+            if best is None or sum(m[1] for m in modules) < sum(m[1] for m in best):
+                best = modules
+        frame = min(_time_first_frame(exam, env) for _ in range(runs)) if has_app else None
+
+    packages: dict[str, float] = defaultdict(float)
+    for name, self_us in best:
+        packages[name.split(".")[0]] += self_us / 1000
+    names = {name for name, _ in best}
+    return StartupResult(
+        exam=exam.stem,
+        import_ms=sum(m[1] for m in best) / 1000,
+        modules=len(best),
+        packages=dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+        frame_ms=frame * 1000 if frame is not None else None,
+        eager=sorted(
+            d for d in DEFERRED if any(n == d or n.startswith(d + ".") for n in names)
+        ),
+    )
+
+
+def _delta(value: float, base: float | None) -> str:
+    if not base:
+        return ""
+    return f" ({(value / base - 1) * 100:+.0f}%)"
+
+
+def _format_report(result: StartupResult, baseline: dict | None, top: int = 10) -> str:
+    base = baseline or {}
+    lines = [
+        f"exam: {result.exam}",
+        f"imports: {result.import_ms:.1f} ms across {result.modules} modules"
+        + _delta(result.import_ms, base.get("import_ms")),
+    ]
+    if result.frame_ms is None:
+        lines.append("first frame: n/a (Textual not installed)")
+    else:
+        lines.append(
+            f"first frame: {result.frame_ms:.1f} ms" + _delta(result.frame_ms, base.get("frame_ms"))
+        )
+    lines.append(f"{'package':<24} {'ms':>8}")
+    base_packages = base.get("packages", {})
+    for name, ms in list(result.packages.items())[:top]:
+        line = f"{name:<24} {ms:>8.1f}"
+        if name in base_packages:
+            line += f"   {ms - base_packages[name]:+.1f}"
+        elif baseline is not None:
+            line += "   new"
+        lines.append(line)
+    if result.eager:
+        lines.append("imported at startup but should be deferred: " + ", ".join(result.eager))
+    return "\n".join(lines)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m examiner.bench_startup",
+        description="Measure import time and time to first frame of the TUI.",
+    )
+    parser.add_argument(
+        "exam", nargs="?", type=Path,
+        help="exam YAML file (default: the first exam in examiner/exams/)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="runs to keep the best of (default: 5)")
+    parser.add_argument("--json", type=Path, help="also write the result to this JSON file")
+    parser.add_argument(
+        "--baseline", type=Path,
+        help="JSON from an earlier --json run to compare against",
+    )
+    parser.add_argument(
+        "--import-budget", type=float, metavar="MS",
+        help="fail if startup imports take longer than this",
+    )
+    parser.add_argument(
+        "--frame-budget", type=float, metavar="MS",
+        help="fail if the first frame takes longer than this",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    exam = args.exam
+    if exam is None:
+        from .loader import discover_exams
+        exams = discover_exams(_EXAMS_DIR)
+        if not exams:
+            print("No exam files found", file=sys.stderr)
+            return 2
+        exam = Path(exams[0]["path"])
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    try:
+        result = measure(exam.resolve(), max(1, args.runs))
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        print(f"Startup failed: {e}", file=sys.stderr)
+        return 2
+
+    print(_format_report(result, baseline))
+    if args.json:
+        args.json.write_text(json.dumps(asdict(result), indent=2))
+
+    failed = bool(result.eager)
+    if args.import_budget is not None and result.import_ms > args.import_budget:
+        print(f"imports over budget: {result.import_ms:.1f} > {args.import_budget:g} ms")
+        failed = True
+    if (
+        args.frame_budget is not None
+        and result.frame_ms is not None
+        and result.frame_ms > args.frame_budget
+    ):
+        print(f"first frame over budget: {result.frame_ms:.1f} > {args.frame_budget:g} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
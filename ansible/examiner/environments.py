@@ -0,0 +1,71 @@
+"""Lab environment overlays — grade one exam against many identical labs.
+
+An overlay is a small YAML file describing one student's lab. Hosts listed
+in it replace (field by field) the exam's own host definitions:
+
+    name: alice            # optional, defaults to the file name
+    hosts:
+      control:
+        ip: "10.0.1.10"
+      node1:
+        ip: "10.0.1.20"
+        ssh_user: vagrant
+        jump: control      # reach node1 through control's connection
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from .lazy import lazy_import
+from .loader import load_exam, validate_jumps
+from .models import Exam, HostDef
+
+# Only needed when an overlay file is read
+yaml = lazy_import("yaml")
+
+
+@dataclass
+class Environment:
+    """One lab environment: a name plus its own copy of the exam."""
+    name: str
+    exam: Exam
+
+
+def apply_overlay(exam: Exam, overlay: dict) -> Exam:
+    """Point ``exam``'s hosts at the machines described by ``overlay``."""
+    for name, hdata in (overlay.get("hosts") or {}).items():
+        base = exam.hosts.get(name)
+        if base is None and "ip" not in hdata:
+            raise ValueError(f"Overlay host {name} is not in the exam and has no ip")
+        exam.hosts[name] = HostDef(
+            name=name,
+            hostname=hdata.get("hostname", base.hostname if base else name),
+            ip=hdata.get("ip", base.ip if base else ""),
+            ssh_user=hdata.get("ssh_user", base.ssh_user if base else "vagrant"),
+            groups=hdata.get("groups", base.groups if base else []),
+            jump=hdata.get("jump", base.jump if base else None),
+        )
+    validate_jumps(exam.hosts)
+    return exam
+
+
+def load_environment(exam_path: str | Path, overlay_path: str | Path) -> Environment:
+    """Load a fresh copy of the exam with an overlay file applied."""
+    overlay_path = Path(overlay_path)
+    with open(overlay_path) as f:
+        overlay = yaml.safe_load(f) or {}
+    exam = apply_overlay(load_exam(exam_path), overlay)
+    return Environment(name=str(overlay.get("name", overlay_path.stem)), exam=exam)
+
+
+def discover_overlays(paths: list[Path]) -> list[Path]:
+    """Expand directories to the overlay YAML files inside them."""
+    found: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(path.glob("*.yml")) + sorted(path.glob("*.yaml")))
+        else:
+            found.append(path)
+    return found
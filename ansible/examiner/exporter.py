@@ -2,130 +2,255 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
+import os
+import shlex
+import shutil
+import tarfile
 from datetime import datetime
 from pathlib import Path
+from typing import TextIO
 
 from .models import CheckStatus, Exam, TaskStatus
 from .verification.ssh import SSHConnectionPool
+from .verification.timing import node_summary, slowest_checks, write_trace
 
 RESULTS_DIR = Path(__file__).parent / "results"
 
 # File extensions to language hints for markdown code blocks
 _LANG_MAP = {"yml": "yaml", "yaml": "yaml", "cfg": "ini", "j2": "jinja2", "conf": "ini"}
 
+# Student files larger than this are left out of the report, and the whole
+# transfer is cut off at MAX_TOTAL_BYTES, so stray logs or binaries under
+# working_dir can't bloat memory or the report.
+MAX_FILE_BYTES = 256 * 1024
+MAX_TOTAL_BYTES = 8 * 1024 * 1024
 
-async def export_grade_report(exam: Exam, pool: SSHConnectionPool) -> Path:
-    """Generate a markdown grade report with scores, check details, and playbook contents."""
-    RESULTS_DIR.mkdir(exist_ok=True)
+# Seconds allowed for the single tar transfer of all student files
+FETCH_TIMEOUT = 60
+
+
+def _write(out: TextIO, *lines: str) -> None:
+    for line in lines:
+        out.write(line)
+        out.write("\n")
+
+
+def _collect_command(working_dir: str) -> str:
+    """Remote command that tars every matching student file to stdout.
+
+    Exits non-zero if tar is missing or fails (pipefail; find's own errors
+    on unreadable directories are ignored). One byte past the cap is sent
+    so a cut-off transfer can be told apart from one that just fits.
+    """
+    find = (
+        f"find {shlex.quote(working_dir)} -maxdepth 5 -type f "
+        "\\( -name '*.yml' -o -name '*.yaml' -o -name '*.cfg' "
+        "-o -name '*.j2' -o -name 'inventory' -o -name '*.conf' \\) "
+        "! -path '*/examiner/*' ! -path '*/.git/*' "
+        f"-size -{MAX_FILE_BYTES + 1}c -print0 2>/dev/null"
+    )
+    pipeline = (
+        f"set -o pipefail; {{ {find} || true; }} "
+        "| sort -z | tar --null -T - -cf - 2>/dev/null "
+        f"| head -c {MAX_TOTAL_BYTES + 1}"
+    )
+    return f"bash -c {shlex.quote(pipeline)}"
+
+
+def _iter_tar(data: bytes):
+    """Yield (path, text) for each file in a tar stream.
+
+    Stops quietly at a truncated member when the stream hit the size cap.
+    """
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r|") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                # GNU tar strips the leading "/" from absolute names
+                yield "/" + member.name.lstrip("/"), f.read().decode(errors="replace")
+    except (tarfile.TarError, EOFError):
+        return
+
+
+async def export_grade_report(
+    exam: Exam,
+    pool: SSHConnectionPool,
+    trace: bool | None = None,
+    directory: Path | None = None,
+) -> Path:
+    """Generate a markdown grade report with scores, check details, and playbook contents.
+
+    Sections are written to disk as they are produced; all student files are
+    fetched from the control node in one tar transfer. With ``trace`` (default:
+    the EXAMINER_TRACE env var) per-check timings are also written to a
+    ``.trace.json`` file next to the report. Reports go to ``directory``
+    (default: RESULTS_DIR).
+    """
+    if trace is None:
+        trace = os.environ.get("EXAMINER_TRACE", "0") != "0"
+    directory = directory or RESULTS_DIR
+    directory.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    filepath = RESULTS_DIR / f"{exam.id}_{timestamp}.md"
-
-    lines: list[str] = []
-
-    # ── Header ──
-    pct = exam.score_percent
-    passed = pct >= exam.passing_score
-    lines.append(f"# Grade Report: {exam.title}")
-    lines.append("")
-    lines.append(f"- **Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"- **Score:** {exam.earned_points:.1f} / {exam.total_points:.1f} ({pct:.0f}%)")
-    lines.append(f"- **Result:** {'PASS' if passed else 'FAIL'} (need {exam.passing_score}%)")
-    lines.append("")
-
-    # Quick summary table
-    lines.append("## Summary")
-    lines.append("")
-    lines.append("| Task | Title | Points | Status |")
-    lines.append("|------|-------|--------|--------|")
-    for task in exam.tasks:
-        s = task.status
-        icon = {"passed": "PASS", "partial": "PARTIAL", "failed": "FAIL"}.get(s.value, "-")
-        lines.append(f"| {task.id} | {task.title} | {task.earned_points:.1f}/{task.points:.1f} | {icon} |")
-    lines.append("")
-
-    # ── Per-task detail ──
-    lines.append("## Detailed Results")
-    lines.append("")
-
-    _STATUS_LABEL = {
-        CheckStatus.PASSED: "OK",
-        CheckStatus.FAILED: "FAIL",
-        CheckStatus.ERROR: "ERROR",
-        CheckStatus.PENDING: "-",
-        CheckStatus.RUNNING: "...",
-    }
-
-    for task in exam.tasks:
-        status_label = {
-            TaskStatus.PASSED: "PASS",
-            TaskStatus.PARTIAL: "PARTIAL",
-            TaskStatus.FAILED: "FAIL",
-            TaskStatus.NOT_STARTED: "NOT GRADED",
-        }.get(task.status, task.status.value)
-
-        lines.append(
-            f"### Task {task.id}: {task.title} "
-            f"({task.earned_points:.1f}/{task.points:.1f} pts) — {status_label}"
+    filepath = directory / f"{exam.id}_{timestamp}.md"
+
+    with open(filepath, "w") as out:
+        # ── Header ──
+        pct = exam.score_percent
+        passed = pct >= exam.passing_score
+        _write(
+            out,
+            f"# Grade Report: {exam.title}",
+            "",
+            f"- **Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"- **Score:** {exam.earned_points:.1f} / {exam.total_points:.1f} ({pct:.0f}%)",
+            f"- **Result:** {'PASS' if passed else 'FAIL'} (need {exam.passing_score}%)",
+            "",
+        )
+
+        # Quick summary table
+        _write(
+            out,
+            "## Summary",
+            "",
+            "| Task | Title | Points | Status |",
+            "|------|-------|--------|--------|",
         )
-        lines.append("")
-        lines.append("| Check | Description | Result | Details |")
-        lines.append("|-------|-------------|--------|---------|")
-        for check, result in zip(task.checks, task.results):
-            r = _STATUS_LABEL.get(result.status, result.status.value)
-            details = (result.error_message or "").replace("|", "\\|")
-            lines.append(f"| {check.id} | {check.description} | {r} | {details} |")
-        lines.append("")
-
-    # ── Student playbooks from control node ──
-    lines.append("---")
-    lines.append("")
-    lines.append("## Student Playbooks")
-    lines.append("")
-
-    control = exam.hosts.get("control")
-    if control:
-        try:
-            rc, file_list = await pool.run_command(
-                "control",
-                control.ip,
-                f"find {exam.working_dir} -maxdepth 5 -type f "
-                "\\( -name '*.yml' -o -name '*.yaml' -o -name '*.cfg' "
-                "-o -name '*.j2' -o -name 'inventory' -o -name '*.conf' \\) "
-                "! -path '*/examiner/*' ! -path '*/.git/*' "
-                "2>/dev/null | sort",
-                control.ssh_user,
+        for task in exam.tasks:
+            s = task.status
+            icon = {"passed": "PASS", "partial": "PARTIAL", "failed": "FAIL"}.get(s.value, "-")
+            _write(out, f"| {task.id} | {task.title} | {task.earned_points:.1f}/{task.points:.1f} | {icon} |")
+        _write(out, "")
+
+        # ── Per-task detail ──
+        _write(out, "## Detailed Results", "")
+
+        _STATUS_LABEL = {
+            CheckStatus.PASSED: "OK",
+            CheckStatus.FAILED: "FAIL",
+            CheckStatus.ERROR: "ERROR",
+            CheckStatus.PENDING: "-",
+            CheckStatus.RUNNING: "...",
+        }
+
+        for task in exam.tasks:
+            status_label = {
+                TaskStatus.PASSED: "PASS",
+                TaskStatus.PARTIAL: "PARTIAL",
+                TaskStatus.FAILED: "FAIL",
+                TaskStatus.NOT_STARTED: "NOT GRADED",
+            }.get(task.status, task.status.value)
+
+            _write(
+                out,
+                f"### Task {task.id}: {task.title} "
+                f"({task.earned_points:.1f}/{task.points:.1f} pts) — {status_label}",
+                "",
+                "| Check | Description | Result | Time | Details |",
+                "|-------|-------------|--------|------|---------|",
             )
-            if rc == 0 and file_list.strip():
-                for remote_path in file_list.strip().splitlines():
-                    remote_path = remote_path.strip()
-                    if not remote_path:
-                        continue
-                    rc2, content = await pool.run_command(
-                        "control", control.ip, f"cat '{remote_path}'", control.ssh_user
-                    )
+            for check, result in zip(task.checks, task.results):
+                r = _STATUS_LABEL.get(result.status, result.status.value)
+                details = (result.error_message or "").replace("|", "\\|")
+                t = result.timing
+                took = "" if t is None else "cached" if t.source == "cache" else f"{t.total:.2f}s"
+                _write(out, f"| {check.id} | {check.description} | {r} | {took} | {details} |")
+            _write(out, "")
+
+        # ── Timing ──
+        summary = node_summary(exam)
+        if summary:
+            _write(
+                out,
+                "## Timing",
+                "",
+                "| Node | Checks | p50 | p95 | Exec p50 | Exec p95 | Connects |",
+                "|------|--------|-----|-----|----------|----------|----------|",
+            )
+            for node, s in summary.items():
+                connects = pool.connect_times.get(node, [])
+                connect = f"{len(connects)} ({max(connects):.2f}s max)" if connects else "-"
+                _write(
+                    out,
+                    f"| {node} | {s['checks']} | {s['p50']:.2f}s | {s['p95']:.2f}s "
+                    f"| {s['exec_p50']:.2f}s | {s['exec_p95']:.2f}s | {connect} |",
+                )
+            _write(out, "", "Slowest checks:", "")
+            for check, result in slowest_checks(exam):
+                _write(out, f"- {result.timing.total:.2f}s — `{check.id}` on {check.node}: {check.description}")
+            _write(out, "")
+
+        # ── Student playbooks from control node ──
+        _write(out, "---", "", "## Student Playbooks", "")
+
+        control = exam.hosts.get("control")
+        if control:
+            try:
+                rc, data = await pool.run_binary(
+                    "control",
+                    control.ip,
+                    _collect_command(exam.working_dir),
+                    control.ssh_user,
+                    timeout=FETCH_TIMEOUT,
+                )
+                truncated = len(data) > MAX_TOTAL_BYTES
+                if truncated:
+                    # tar was cut off by head, so its rc (SIGPIPE) means nothing
+                    data = data[:MAX_TOTAL_BYTES]
+                found = False
+                for remote_path, content in _iter_tar(data):
+                    found = True
                     ext = remote_path.rsplit(".", 1)[-1] if "." in remote_path else ""
                     lang = _LANG_MAP.get(ext, "")
-                    lines.append(f"### `{remote_path}`")
-                    lines.append("")
-                    lines.append(f"```{lang}")
-                    lines.append(content.rstrip() if rc2 == 0 else f"# Error reading file: rc={rc2}")
-                    lines.append("```")
-                    lines.append("")
-            else:
-                lines.append("*No playbook files found on control node.*")
-                lines.append("")
-        except Exception as e:
-            lines.append(f"*Error connecting to control node: {e}*")
-            lines.append("")
-
-    # ── Reference Solutions ──
-    if exam.solutions_file and Path(exam.solutions_file).exists():
-        lines.append("---")
-        lines.append("")
-        lines.append("## Reference Solutions")
-        lines.append("")
-        lines.append(Path(exam.solutions_file).read_text())
-
-    filepath.write_text("\n".join(lines))
+                    _write(
+                        out,
+                        f"### `{remote_path}`",
+                        "",
+                        f"```{lang}",
+                        content.rstrip(),
+                        "```",
+                        "",
+                    )
+                if truncated:
+                    _write(
+                        out,
+                        f"*Transfer cut off at {MAX_TOTAL_BYTES // (1024 * 1024)} MiB; "
+                        "later files are not included.*",
+                        "",
+                    )
+                elif rc != 0:
+                    _write(
+                        out,
+                        f"*Error collecting playbook files on control node (exit code {rc}); "
+                        "files may be missing.*",
+                        "",
+                    )
+                if found:
+                    _write(out, f"*Files over {MAX_FILE_BYTES // 1024} KiB are not included.*", "")
+                elif rc == 0 and not truncated:
+                    _write(out, "*No playbook files found on control node.*", "")
+            except asyncio.TimeoutError:
+                _write(
+                    out,
+                    f"*Timed out after {FETCH_TIMEOUT}s collecting playbook files "
+                    "from control node.*",
+                    "",
+                )
+            except Exception as e:
+                _write(out, f"*Error connecting to control node: {e}*", "")
+
+        # ── Reference Solutions ──
+        if exam.solutions_file and Path(exam.solutions_file).exists():
+            _write(out, "---", "", "## Reference Solutions", "")
+            with open(exam.solutions_file) as src:
+                shutil.copyfileobj(src, out)
+
+    if trace:
+        write_trace(exam, filepath.with_suffix(".trace.json"), pool.connect_times)
     return filepath
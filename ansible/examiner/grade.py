@@ -0,0 +1,265 @@
+"""Headless grading: python -m examiner grade <exam.yml> [options].
+
+Runs every check at full concurrency and writes machine-readable results
+without importing Textual. With ``--env`` overlays the same exam is graded
+against many lab environments at once over one shared connection pool.
+Exit status is 0 when every score reaches the exam's passing_score, 1 when
+one doesn't, and 2 on usage or load errors.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from .environments import Environment, discover_overlays, load_environment
+from .loader import load_exam
+from .models import CheckStatus, Exam
+from .verification.cache import ResultCache
+from .verification.runner import VerificationRunner, global_limit
+from .verification.ssh import SSHConnectionPool
+
+
+def exam_to_dict(exam: Exam) -> dict:
+    """Score summary plus every task and check result."""
+    pct = exam.score_percent
+    return {
+        "exam_id": exam.id,
+        "title": exam.title,
+        "score": {
+            "earned": exam.earned_points,
+            "total": exam.total_points,
+            "percent": pct,
+            "passing_score": exam.passing_score,
+            "passed": pct >= exam.passing_score,
+        },
+        "tasks": [
+            {
+                "id": task.id,
+                "title": task.title,
+                "points": task.points,
+                "earned": task.earned_points,
+                "status": task.status.value,
+                "checks": [
+                    {
+                        "id": check.id,
+                        "description": check.description,
+                        "node": check.node,
+                        "status": result.status.value,
+                        "rc": result.actual_rc,
+                        "error": result.error_message,
+                        "time": result.timing.total if result.timing else None,
+                    }
+                    for check, result in zip(task.checks, task.results)
+                ],
+            }
+            for task in exam.tasks
+        ],
+    }
+
+
+def environments_to_dict(envs: list[Environment]) -> dict:
+    """Per-environment results plus a combined summary."""
+    results = [dict(exam_to_dict(env.exam), environment=env.name) for env in envs]
+    passed = sum(1 for r in results if r["score"]["passed"])
+    return {
+        "exam_id": envs[0].exam.id if envs else None,
+        "summary": {
+            "environments": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "mean_percent": (
+                sum(r["score"]["percent"] for r in results) / len(results)
+                if results else 0.0
+            ),
+        },
+        "environments": results,
+    }
+
+
+def _junit_suites(root: ET.Element, exam: Exam, prefix: str = "") -> None:
+    for task in exam.tasks:
+        statuses = [r.status for r in task.results]
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=f"{prefix}Task {task.id}: {task.title}",
+            tests=str(len(task.checks)),
+            failures=str(statuses.count(CheckStatus.FAILED)),
+            errors=str(statuses.count(CheckStatus.ERROR)),
+        )
+        for check, result in zip(task.checks, task.results):
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname=f"{exam.id}.task{task.id}",
+                name=f"{check.id} {check.description}",
+                time=f"{result.timing.total:.3f}" if result.timing else "0",
+            )
+            message = result.error_message or ""
+            if result.status == CheckStatus.FAILED:
+                ET.SubElement(case, "failure", message=message)
+            elif result.status == CheckStatus.ERROR:
+                ET.SubElement(case, "error", message=message)
+            elif result.status != CheckStatus.PASSED:
+                ET.SubElement(case, "skipped")
+
+
+def exam_to_junit(exam: Exam) -> str:
+    """JUnit XML: one testsuite per task, one testcase per check."""
+    root = ET.Element("testsuites", name=exam.title)
+    _junit_suites(root, exam)
+    ET.indent(root)
+    return ET.tostring(root, encoding="unicode", xml_declaration=True) + "\n"
+
+
+def environments_to_junit(envs: list[Environment]) -> str:
+    """JUnit XML with one testsuite per (environment, task)."""
+    root = ET.Element("testsuites", name=envs[0].exam.title if envs else "")
+    for env in envs:
+        _junit_suites(root, env.exam, prefix=f"{env.name} / ")
+    ET.indent(root)
+    return ET.tostring(root, encoding="unicode", xml_declaration=True) + "\n"
+
+
+async def grade_exam(
+    exam: Exam,
+    pool: SSHConnectionPool,
+    node_concurrency: int | None = None,
+    global_concurrency: int | None = None,
+    use_cache: bool = False,
+    cache_id: str | None = None,
+    global_sem: asyncio.Semaphore | None = None,
+) -> Exam:
+    """Verify every task of ``exam`` in place and return it.
+
+    ``cache_id`` keeps result caches of different environments apart;
+    ``global_sem`` is a global limit shared with other environments.
+    """
+    runner = VerificationRunner(
+        pool,
+        exam,
+        node_concurrency=node_concurrency,
+        global_concurrency=global_concurrency,
+        cache=ResultCache.for_exam(cache_id or exam.id) if use_cache else None,
+        global_sem=global_sem,
+    )
+    await runner.verify_all()
+    return exam
+
+
+async def _grade(args: argparse.Namespace, exams: list[tuple[str | None, Exam]]) -> None:
+    # One pool for every environment; it caps total open connections
+    pool = SSHConnectionPool(max_connections=args.max_connections)
+    parallel = asyncio.Semaphore(max(1, args.parallel))
+    # --concurrency caps the whole run, not each environment
+    global_sem = global_limit(args.concurrency)
+
+    async def grade_one(env_name: str | None, exam: Exam) -> None:
+        async with parallel:
+            await grade_exam(
+                exam,
+                pool,
+                node_concurrency=args.node_concurrency,
+                global_concurrency=args.concurrency,
+                use_cache=args.cache,
+                cache_id=f"{exam.id}@{env_name}" if env_name else None,
+                global_sem=global_sem,
+            )
+
+    try:
+        await asyncio.gather(*(grade_one(name, exam) for name, exam in exams))
+    finally:
+        await pool.close_all()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="examiner grade",
+        description="Grade an exam without the TUI and print machine-readable results.",
+    )
+    parser.add_argument("exam", type=Path, help="exam YAML file")
+    parser.add_argument(
+        "-f", "--format", choices=("json", "junit"), default="json",
+        help="output format (default: json)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path,
+        help="write results to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--concurrency", type=int,
+        help="max checks running at once across all VMs",
+    )
+    parser.add_argument(
+        "--node-concurrency", type=int,
+        help="max checks running at once on one VM",
+    )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="reuse cached results for file checks whose files are unchanged",
+    )
+    parser.add_argument(
+        "-e", "--env", type=Path, action="append", default=[],
+        help="lab environment overlay file, or a directory of them (repeatable)",
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=16,
+        help="environments graded at once (default: 16)",
+    )
+    parser.add_argument(
+        "--max-connections", type=int,
+        help="cap on open SSH connections across all environments",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    envs: list[Environment] = []
+    try:
+        if args.env:
+            overlays = discover_overlays(args.env)
+            if not overlays:
+                print("No environment overlay files found", file=sys.stderr)
+                return 2
+            envs = [load_environment(args.exam, path) for path in overlays]
+            exams = [env.exam for env in envs]
+        else:
+            exams = [load_exam(args.exam)]
+    except Exception as e:
+        print(f"Cannot load exam {args.exam}: {e}", file=sys.stderr)
+        return 2
+
+    names = [env.name for env in envs] or [None]
+    asyncio.run(_grade(args, list(zip(names, exams))))
+
+    if envs:
+        text = (
+            environments_to_junit(envs) if args.format == "junit"
+            else json.dumps(environments_to_dict(envs), indent=2) + "\n"
+        )
+    elif args.format == "junit":
+        text = exam_to_junit(exams[0])
+    else:
+        text = json.dumps(exam_to_dict(exams[0]), indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+
+    all_passed = True
+    for name, exam in zip(names, exams):
+        pct = exam.score_percent
+        passed = pct >= exam.passing_score
+        all_passed = all_passed and passed
+        print(
+            f"{name or exam.title}: {exam.earned_points:.1f}/{exam.total_points:.1f} "
+            f"({pct:.0f}%) — {'PASS' if passed else 'FAIL'}",
+            file=sys.stderr,
+        )
+    return 0 if all_passed else 1
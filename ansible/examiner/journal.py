@@ -0,0 +1,268 @@
+"""Results journal — every check outcome, appended to a local SQLite file.
+
+Each run of an exam belongs to an attempt; the TUI restores the latest
+attempt's results on launch and starts a new attempt on reset-all. Writes
+go through a background thread that commits in batches, so recording a
+result never blocks the UI. The journal also answers history queries:
+
+    python -m examiner stats <exam.yml | exam_id>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from .models import Check, CheckResult, CheckStatus, Exam, Task
+
+# Override with EXAMINER_DATA_DIR; set EXAMINER_JOURNAL=0 to disable
+DATA_DIR = Path(
+    os.environ.get("EXAMINER_DATA_DIR", Path.home() / ".local" / "share" / "examiner")
+)
+JOURNAL_PATH = DATA_DIR / "journal.db"
+
+# The writer commits after this many seconds, or this many records,
+# whichever comes first
+COMMIT_INTERVAL = 0.5
+COMMIT_BATCH = 500
+
+# Stored stdout is capped; the journal is history, not a full log
+MAX_STDOUT = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    exam_id TEXT NOT NULL,
+    started REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_exam ON attempts (exam_id, id);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    attempt INTEGER NOT NULL REFERENCES attempts (id),
+    task_id TEXT NOT NULL,
+    check_id TEXT NOT NULL,
+    check_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    rc INTEGER,
+    stdout TEXT,
+    error TEXT,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_check ON results (attempt, task_id, check_id, id);
+"""
+
+# Latest result per check of each attempt
+_LATEST = """
+SELECT r.* FROM results r
+JOIN (
+    SELECT MAX(results.id) AS id FROM results
+    JOIN attempts a ON a.id = results.attempt
+    WHERE {where}
+    GROUP BY results.attempt, results.task_id, results.check_id
+) latest ON latest.id = r.id
+"""
+
+_STOP = object()
+
+
+def enabled() -> bool:
+    return os.environ.get("EXAMINER_JOURNAL", "1") != "0"
+
+
+def check_hash(check: Check) -> str:
+    """Identifies a check's definition, so results of a check whose
+    command or expectations have since changed are never restored."""
+    return hashlib.sha1(repr(sorted(asdict(check).items())).encode()).hexdigest()[:16]
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, timeout=10)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+class Journal:
+    """Append-only store of check results for one exam."""
+
+    def __init__(self, exam: Exam, path: str | Path = JOURNAL_PATH) -> None:
+        self.exam = exam
+        self.path = Path(path)
+        self._db = _connect(self.path)
+        self._hashes = {
+            (task.id, check.id): check_hash(check)
+            for task in exam.tasks
+            for check in task.checks
+        }
+        row = self._db.execute(
+            "SELECT MAX(id) FROM attempts WHERE exam_id = ?", (exam.id,)
+        ).fetchone()
+        self.attempt: int | None = row[0]
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+
+    def restore(self) -> int:
+        """Apply the latest attempt's last result per check to the exam.
+
+        Returns how many checks were restored.
+        """
+        if self.attempt is None:
+            return 0
+        rows = self._db.execute(
+            _LATEST.format(where="results.attempt = ?"), (self.attempt,)
+        ).fetchall()
+        restored = 0
+        for row in rows:
+            key = (row["task_id"], row["check_id"])
+            task = self.exam.get_task(row["task_id"])
+            if task is None or self._hashes.get(key) != row["check_hash"]:
+                continue
+            for check, result in zip(task.checks, task.results):
+                if check.id == row["check_id"]:
+                    result.actual_rc = row["rc"]
+                    result.actual_stdout = row["stdout"]
+                    result.error_message = row["error"]
+                    result.timing = None
+                    result.status = CheckStatus(row["status"])
+                    restored += 1
+        return restored
+
+    def new_attempt(self) -> int:
+        """Start a new attempt; results recorded from now on belong to it."""
+        # Written synchronously so later records can't land in the old one
+        self.flush()
+        cursor = self._db.execute(
+            "INSERT INTO attempts (exam_id, started) VALUES (?, ?)",
+            (self.exam.id, time.time()),
+        )
+        self._db.commit()
+        self.attempt = cursor.lastrowid
+        return self.attempt
+
+    def record(self, task: Task, check: Check, result: CheckResult) -> None:
+        """Queue one result for writing; returns immediately."""
+        if self.attempt is None:
+            self.new_attempt()
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="examiner-journal", daemon=True
+            )
+            self._writer.start()
+        stdout = result.actual_stdout
+        self._queue.put((
+            self.attempt, task.id, check.id, self._hashes.get((task.id, check.id), ""),
+            result.status.value, result.actual_rc,
+            stdout[:MAX_STDOUT] if stdout else stdout, result.error_message,
+            time.time(),
+        ))
+
+    def _write_loop(self) -> None:
+        db = _connect(self.path)
+        stop = False
+        while not stop:
+            rows = [self._queue.get()]
+            deadline = time.monotonic() + COMMIT_INTERVAL
+            while len(rows) < COMMIT_BATCH:
+                try:
+                    rows.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            flushes = [r for r in rows if isinstance(r, threading.Event)]
+            stop = any(r is _STOP for r in rows)
+            rows = [r for r in rows if isinstance(r, tuple)]
+            if rows:
+                try:
+                    with db:
+                        db.executemany(
+                            "INSERT INTO results (attempt, task_id, check_id, check_hash,"
+                            " status, rc, stdout, error, recorded)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                except sqlite3.Error:
+                    pass  # best effort, like the result cache
+            for event in flushes:
+                event.set()
+        db.close()
+
+    def flush(self) -> None:
+        """Wait until everything recorded so far is committed."""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._db.close()
+
+
+def pass_rates(exam_id: str, path: str | Path = JOURNAL_PATH) -> list[sqlite3.Row]:
+    """Per check: attempts that ran it (to a pass or fail) and how many of
+    those ended with it passing, judged by each attempt's last result."""
+    db = _connect(Path(path))
+    try:
+        return db.execute(
+            "SELECT task_id, check_id, COUNT(*) AS attempts,"
+            " SUM(status = 'passed') AS passed FROM ("
+            + _LATEST.format(where="a.exam_id = ? AND results.status IN ('passed', 'failed')")
+            + ") GROUP BY task_id, check_id ORDER BY passed * 1.0 / attempts, task_id, check_id",
+            (exam_id,),
+        ).fetchall()
+    finally:
+        db.close()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="examiner stats",
+        description="Per-check pass rates across every journaled attempt.",
+    )
+    parser.add_argument("exam", help="exam YAML file or exam id")
+    parser.add_argument("--limit", type=int, help="show only the N hardest checks")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    exam_id = args.exam
+    if args.exam.endswith((".yml", ".yaml")):
+        from .loader import load_exam
+        try:
+            exam_id = load_exam(args.exam).id
+        except Exception as e:
+            print(f"Cannot load exam {args.exam}: {e}", file=sys.stderr)
+            return 2
+    if not JOURNAL_PATH.exists():
+        print(f"No journal at {JOURNAL_PATH}", file=sys.stderr)
+        return 1
+    rows = pass_rates(exam_id)
+    if not rows:
+        print(f"No results journaled for {exam_id}", file=sys.stderr)
+        return 1
+    print(f"{'task':<6} {'check':<16} {'attempts':>8} {'passed':>7} {'rate':>6}")
+    for row in rows[:args.limit]:
+        rate = row["passed"] / row["attempts"] * 100
+        print(
+            f"{row['task_id']:<6} {row['check_id']:<16} "
+            f"{row['attempts']:>8} {row['passed']:>7} {rate:>5.0f}%"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
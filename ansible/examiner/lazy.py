@@ -0,0 +1,34 @@
+"""Deferred imports for heavy dependencies.
+
+asyncssh (with its crypto stack) and PyYAML cost a large share of startup
+time but aren't needed until the first connection or the first exam parse.
+``lazy_import`` registers a module that is only executed the first time one
+of its attributes is used, so ``asyncssh.connect`` and friends keep working
+unchanged while ``import examiner.app`` stays cheap.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """``name``, loaded on first attribute access instead of now.
+
+    Returns the real module if something already imported it. Missing
+    modules raise ``ImportError`` here, not at first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -2,18 +2,119 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import pickle
 from pathlib import Path
 
-import yaml
-
+from .lazy import lazy_import
 from .models import Check, Exam, HostDef, Task
+from .verification.cache import CACHE_DIR
+from .verification.native import validate_params
+
+# Only needed when an exam isn't snapshotted yet
+yaml = lazy_import("yaml")
+
+
+def _yaml_loader() -> type:
+    """libyaml's C parser when available — several times faster than pure Python."""
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Parsed exams are snapshotted here, keyed by path + mtime + size, so an
+# unchanged file is never re-parsed. Disable with EXAMINER_EXAM_CACHE=0.
+_COMPILED_DIR = CACHE_DIR / "exams"
+_INDEX_FILE = _COMPILED_DIR / "index.json"
+_SNAPSHOT_VERSION = 7
+
+# Check fields common to every type; the rest are a typed check's params
+_CHECK_KEYS = {
+    "id", "description", "node", "type", "command",
+    "expect_rc", "expect_stdout", "expect_stdout_contains", "heavy",
+}
+
+# Top-level keys picked up by the header scan
+_HEADER_KEYS = ("id", "title", "duration", "passing_score")
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("EXAMINER_EXAM_CACHE", "1") != "0"
+
+
+def _file_key(path: Path) -> list:
+    """Identity of a file's current contents: [path, mtime_ns, size]."""
+    st = path.stat()
+    return [str(path.resolve()), st.st_mtime_ns, st.st_size]
+
+
+def _snapshot_path(key: list) -> Path:
+    return _COMPILED_DIR / (hashlib.sha1(key[0].encode()).hexdigest() + ".pickle")
+
+
+def _read_snapshot(key: list) -> Exam | None:
+    try:
+        with open(_snapshot_path(key), "rb") as f:
+            version, cached_key, exam = pickle.load(f)
+    except Exception:
+        return None
+    if version != _SNAPSHOT_VERSION or cached_key != key:
+        return None
+    return exam
+
+
+def _write_snapshot(key: list, exam: Exam) -> None:
+    try:
+        _COMPILED_DIR.mkdir(parents=True, exist_ok=True)
+        target = _snapshot_path(key)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((_SNAPSHOT_VERSION, key, exam), f, pickle.HIGHEST_PROTOCOL)
+        tmp.replace(target)
+    except OSError:
+        pass
+
+
+def _read_yaml(path: Path) -> dict:
+    with open(path) as f:
+        return yaml.load(f, Loader=_yaml_loader())
 
 
 def load_exam(path: str | Path) -> Exam:
-    """Parse a YAML exam file and return an Exam model."""
+    """Return the Exam model for a YAML exam file.
+
+    Uses the compiled snapshot when the file is unchanged since it was last
+    parsed; otherwise parses the YAML and refreshes the snapshot.
+    """
     path = Path(path)
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    if not _cache_enabled():
+        return _parse_exam(path)
+    key = _file_key(path)
+    exam = _read_snapshot(key)
+    if exam is None:
+        exam = _parse_exam(path)
+        _write_snapshot(key, exam)
+    return exam
+
+
+def validate_jumps(hosts: dict[str, HostDef]) -> None:
+    """Raise ValueError unless every ``jump`` names another defined host
+    and no chain of jump hosts leads back to where it started."""
+    for name, host in hosts.items():
+        seen = {name}
+        jump = host.jump
+        while jump is not None:
+            if jump not in hosts:
+                raise ValueError(f"Host {name}: jump host {jump!r} is not defined")
+            if jump in seen:
+                raise ValueError(f"Host {name}: jump hosts loop back to {jump}")
+            seen.add(jump)
+            jump = hosts[jump].jump
+
+
+def _parse_exam(path: Path) -> Exam:
+    """Parse a YAML exam file and return an Exam model."""
+    data = _read_yaml(path)
 
     hosts: dict[str, HostDef] = {}
     for name, hdata in data.get("hosts", {}).items():
@@ -23,20 +124,40 @@ def load_exam(path: str | Path) -> Exam:
             ip=hdata["ip"],
             ssh_user=hdata.get("ssh_user", "vagrant"),
             groups=hdata.get("groups", []),
+            jump=hdata.get("jump"),
         )
+    validate_jumps(hosts)
 
     tasks: list[Task] = []
     for tdata in data.get("tasks", []):
         checks: list[Check] = []
         for cdata in tdata.get("checks", []):
+            check_type = cdata.get("type", "command")
+            if check_type == "command":
+                checks.append(Check(
+                    id=cdata["id"],
+                    description=cdata["description"],
+                    node=cdata["node"],
+                    command=cdata["command"],
+                    expect_rc=cdata.get("expect_rc", 0),
+                    expect_stdout=cdata.get("expect_stdout"),
+                    expect_stdout_contains=cdata.get("expect_stdout_contains"),
+                    heavy=bool(cdata.get("heavy", False)),
+                ))
+                continue
+            try:
+                params = validate_params(
+                    check_type,
+                    {k: v for k, v in cdata.items() if k not in _CHECK_KEYS},
+                )
+            except ValueError as e:
+                raise ValueError(f"Check {cdata.get('id')}: {e}") from None
             checks.append(Check(
                 id=cdata["id"],
                 description=cdata["description"],
                 node=cdata["node"],
-                command=cdata["command"],
-                expect_rc=cdata.get("expect_rc", 0),
-                expect_stdout=cdata.get("expect_stdout"),
-                expect_stdout_contains=cdata.get("expect_stdout_contains"),
+                type=check_type,
+                params=params,
             ))
         tasks.append(Task(
             id=tdata["id"],
@@ -63,19 +184,125 @@ def load_exam(path: str | Path) -> Exam:
     )
 
 
+def _read_index() -> dict[str, dict]:
+    try:
+        data = json.loads(_INDEX_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _SNAPSHOT_VERSION:
+        return {}
+    return data.get("exams", {})
+
+
+def _write_index(entries: dict[str, dict]) -> None:
+    try:
+        _COMPILED_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = _INDEX_FILE.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": _SNAPSHOT_VERSION, "exams": entries}))
+        tmp.replace(_INDEX_FILE)
+    except OSError:
+        pass
+
+
+def read_exam_header(path: str | Path, details: bool = True) -> dict:
+    """Read exam metadata from the YAML event stream without building the
+    document.
+
+    Always returns ``path``, ``id`` and ``title``. With ``details=False`` the
+    scan stops as soon as the top-level id and title have been seen; with
+    ``details=True`` it runs to the end to also count ``task_count`` and
+    ``total_points`` and pick up ``duration`` and ``passing_score``.
+    """
+    path = Path(path)
+    header: dict = {}
+    task_count = 0
+    total_points = 0.0
+    task_points = 0.0
+    # One frame per open container: [is_mapping, current_key, expecting_key]
+    stack: list[list] = []
+
+    def in_task() -> bool:
+        return (
+            len(stack) == 3
+            and stack[0][1] == "tasks"
+            and not stack[1][0]
+        )
+
+    with open(path) as f:
+        for event in yaml.parse(f, Loader=_yaml_loader()):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                is_mapping = isinstance(event, yaml.MappingStartEvent)
+                stack.append([is_mapping, None, is_mapping])
+                if is_mapping and in_task():
+                    task_count += 1
+                    task_points = 1.0
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                if in_task():
+                    total_points += task_points
+                stack.pop()
+                if not stack:
+                    break  # end of the first document
+                if stack[-1][0]:
+                    stack[-1][2] = True
+            elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)) and stack:
+                frame = stack[-1]
+                if not frame[0]:
+                    continue
+                if frame[2]:
+                    frame[1] = getattr(event, "value", None)
+                    frame[2] = False
+                    continue
+                frame[2] = True
+                value = getattr(event, "value", None)
+                if len(stack) == 1 and frame[1] in _HEADER_KEYS:
+                    header[frame[1]] = value
+                    if not details and "id" in header and "title" in header:
+                        break
+                elif in_task() and frame[1] == "points":
+                    try:
+                        task_points = float(value)
+                    except (TypeError, ValueError):
+                        pass
+
+    info = {
+        "path": str(path),
+        "id": header.get("id") or path.stem,
+        "title": header.get("title") or path.stem,
+    }
+    if details:
+        info["task_count"] = task_count
+        info["total_points"] = total_points
+        for name, default in (("duration", 14400), ("passing_score", 70.0)):
+            try:
+                info[name] = type(default)(header.get(name, default))
+            except (TypeError, ValueError):
+                info[name] = default
+    return info
+
+
 def discover_exams(directory: str | Path) -> list[dict]:
-    """List available exam YAML files in a directory."""
+    """List available exam YAML files in a directory.
+
+    Each entry has path, id, title, duration, passing_score, task_count and
+    total_points. Metadata comes from the discovery index when a file is
+    unchanged; new or edited files are scanned with ``read_exam_header``.
+    """
     directory = Path(directory)
+    use_cache = _cache_enabled()
+    index = _read_index() if use_cache else {}
+    changed = False
     exams = []
     for p in sorted(directory.glob("*.yml")):
         try:
-            with open(p) as f:
-                data = yaml.safe_load(f)
-            exams.append({
-                "path": str(p),
-                "id": data.get("id", p.stem),
-                "title": data.get("title", p.stem),
-            })
+            key = _file_key(p)
+            entry = index.get(key[0])
+            if entry is None or entry.get("key") != key:
+                entry = {"key": key, "info": read_exam_header(p)}
+                index[key[0]] = entry
+                changed = True
+            exams.append(dict(entry["info"], path=str(p)))
         except Exception:
             continue
+    if use_cache and changed:
+        _write_index(index)
     return exams
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Callable
 
 
 class CheckStatus(Enum):
@@ -25,24 +26,59 @@ class TaskStatus(Enum):
 
 @dataclass
 class Check:
-    """A single verification check — run a command on a node, assert the result."""
+    """A single verification check — run a command on a node, assert the result.
+
+    Typed checks (``type`` other than "command") have no command; their
+    fields are kept in ``params`` and evaluated by verification.native.
+    """
     id: str
     description: str
     node: str
-    command: str
+    command: str = ""
     expect_rc: int | None = 0
     expect_stdout: str | None = None
     expect_stdout_contains: str | None = None
+    type: str = "command"
+    params: dict = field(default_factory=dict)
+    heavy: bool = False  # expensive command: run once per pass, share output
+
+
+@dataclass
+class CheckTiming:
+    """Where the time went for one check, in seconds."""
+    connect: float = 0.0  # getting a connection (0 when reused)
+    reused: bool = True  # connection came from the pool
+    exec: float = 0.0  # remote command, or the whole batch it ran in
+    total: float = 0.0  # wall time including waiting for a free slot
+    source: str = "exec"  # exec | batch | native | snapshot | shared | cache
 
 
 @dataclass
 class CheckResult:
-    """Result of running a single check."""
+    """Result of running a single check.
+
+    Assigning ``status`` notifies the owning task so its counters stay
+    current.
+    """
     check_id: str
     status: CheckStatus = CheckStatus.PENDING
     actual_rc: int | None = None
     actual_stdout: str | None = None
     error_message: str | None = None
+    timing: CheckTiming | None = None
+    _listener: Callable[[CheckResult, CheckStatus, CheckStatus], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        if name != "status":
+            object.__setattr__(self, name, value)
+            return
+        old = self.__dict__.get("status")
+        object.__setattr__(self, name, value)
+        listener = self.__dict__.get("_listener")
+        if listener is not None and old is not None and old != value:
+            listener(self, old, value)
 
 
 @dataclass
@@ -53,6 +89,7 @@ class HostDef:
     ip: str
     ssh_user: str = "vagrant"
     groups: list[str] = field(default_factory=list)
+    jump: str | None = None  # host whose connection this one is tunnelled through
 
 
 @dataclass
@@ -64,24 +101,49 @@ class Task:
     description: str
     checks: list[Check] = field(default_factory=list)
     results: list[CheckResult] = field(default_factory=list)
+    # Running counters, kept current by CheckResult status changes
+    _passed: int = field(default=0, init=False, repr=False, compare=False)
+    _pending: int = field(default=0, init=False, repr=False, compare=False)
+    # Called with the change in earned points: (task, delta)
+    _listener: Callable[[Task, float], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def init_results(self) -> None:
-        """Create a CheckResult for each check if not already present."""
+        """Create a CheckResult for each check if not already present,
+        and start tracking their status."""
         if len(self.results) != len(self.checks):
             self.results = [
                 CheckResult(check_id=c.id) for c in self.checks
             ]
+        before = self.earned_points
+        self._passed = self._pending = 0
+        for r in self.results:
+            r._listener = self._on_result_status
+            self._passed += r.status == CheckStatus.PASSED
+            self._pending += r.status == CheckStatus.PENDING
+        self._notify(before)
+
+    def _on_result_status(
+        self, result: CheckResult, old: CheckStatus, new: CheckStatus
+    ) -> None:
+        before = self.earned_points
+        self._passed += (new == CheckStatus.PASSED) - (old == CheckStatus.PASSED)
+        self._pending += (new == CheckStatus.PENDING) - (old == CheckStatus.PENDING)
+        self._notify(before)
+
+    def _notify(self, before: float) -> None:
+        delta = self.earned_points - before
+        if delta and self._listener is not None:
+            self._listener(self, delta)
 
     @property
     def status(self) -> TaskStatus:
-        if not self.results or all(
-            r.status == CheckStatus.PENDING for r in self.results
-        ):
+        if not self.results or self._pending == len(self.results):
             return TaskStatus.NOT_STARTED
-        passed = sum(1 for r in self.results if r.status == CheckStatus.PASSED)
-        if passed == len(self.checks):
+        if self._passed == len(self.checks):
             return TaskStatus.PASSED
-        if passed > 0:
+        if self._passed > 0:
             return TaskStatus.PARTIAL
         return TaskStatus.FAILED
 
@@ -90,8 +152,7 @@ class Task:
         """Partial credit: fraction of checks passed * points."""
         if not self.checks:
             return 0.0
-        passed = sum(1 for r in self.results if r.status == CheckStatus.PASSED)
-        return self.points * (passed / len(self.checks))
+        return self.points * (self._passed / len(self.checks))
 
 
 @dataclass
@@ -105,18 +166,36 @@ class Exam:
     tasks: list[Task] = field(default_factory=list)
     working_dir: str = "/home/vagrant/ansible"
     solutions_file: str | None = None
+    _task_index: dict[str, Task] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _total_points: float = field(default=0.0, init=False, repr=False, compare=False)
+    _earned_points: float = field(default=0.0, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         for task in self.tasks:
             task.init_results()
+            task._listener = self._on_task_points
+            self._task_index[task.id] = task
+            self._total_points += task.points
+            self._earned_points += task.earned_points
+
+    def _on_task_points(self, task: Task, delta: float) -> None:
+        self._earned_points += delta
+
+    def get_task(self, task_id: str | None) -> Task | None:
+        """Look up a task by id."""
+        if task_id is None:
+            return None
+        return self._task_index.get(task_id)
 
     @property
     def total_points(self) -> float:
-        return sum(t.points for t in self.tasks)
+        return self._total_points
 
     @property
     def earned_points(self) -> float:
-        return sum(t.earned_points for t in self.tasks)
+        # Rounded and clamped so float drift from running deltas never
+        # shows as a tiny non-zero (or negative zero) score
+        return max(0.0, round(self._earned_points, 9))
 
     @property
     def score_percent(self) -> float:
@@ -0,0 +1,116 @@
+"""Batch execution — pack many check commands into one remote shell script."""
+
+from __future__ import annotations
+
+import secrets
+import shlex
+from typing import Callable
+
+from .capture import OutputWindow
+
+# Exit code `timeout` returns when it had to kill the command
+TIMEOUT_RC = 124
+
+
+def build_script(commands: list[str], timeout: int) -> tuple[str, str]:
+    """Build a script that runs each command and frames its result.
+
+    Every command runs in its own ``bash -c`` subshell under ``timeout``
+    with stdin closed and stderr discarded (matching a single exec, where
+    only stdout is captured). Output is a sequence of records::
+
+        <marker> BEGIN <index>
+        <stdout>
+        <marker> END <index> <rc>
+
+    Returns ``(script, marker)``; the marker is random per script so
+    command output can't forge a frame.
+    """
+    marker = f"__EXAMINER_{secrets.token_hex(8)}__"
+    lines = []
+    for i, command in enumerate(commands):
+        lines.append(f"printf '%s BEGIN {i}\\n' {marker}")
+        lines.append(
+            f"( timeout -k 2 {timeout} bash -c {shlex.quote(command)} "
+            "</dev/null 2>/dev/null )"
+        )
+        lines.append(f"printf '\\n%s END {i} %d\\n' {marker} $?")
+    return "\n".join(lines) + "\n", marker
+
+
+class BatchReader:
+    """Incremental parser for a batch script's framed output.
+
+    Feed stdout as it arrives; each record's stdout goes into the window
+    ``window(index)`` returns, so only bounded parts of it are kept.
+    Finished records are in ``records`` as ``{index: (rc, window)}``.
+    Records that never reached their END line (script killed or
+    connection dropped mid-batch) are left out.
+    """
+
+    def __init__(
+        self, marker: str, window: Callable[[int], OutputWindow] = lambda _: OutputWindow(None)
+    ) -> None:
+        self._begin = f"{marker} BEGIN "
+        self._end = f"\n{marker} END "
+        self._window = window
+        self._buffer = ""
+        self._index: int | None = None  # record being read, if any
+        self._current: OutputWindow | None = None
+        self.records: dict[int, tuple[int, OutputWindow]] = {}
+
+    def feed(self, text: str, final: bool = False) -> bool:
+        """Parse another chunk. Always False: a batch is never cut short."""
+        buffer = self._buffer + text
+        pos = 0
+        while True:
+            if self._current is None:
+                start = buffer.find(self._begin, pos)
+                header_end = buffer.find("\n", start) if start >= 0 else -1
+                if header_end < 0:
+                    # Keep a possible partial header for the next chunk
+                    pos = max(pos, start if start >= 0 else len(buffer) - len(self._begin))
+                    break
+                try:
+                    self._index = int(buffer[start + len(self._begin):header_end])
+                except ValueError:
+                    pos = header_end
+                    continue
+                self._current = self._window(self._index)
+                pos = header_end + 1
+            stop = buffer.find(self._end, pos)
+            if stop < 0:
+                # Everything but a possible partial END marker is stdout
+                safe = len(buffer) if final else max(pos, len(buffer) - len(self._end) + 1)
+                self._current.feed(buffer[pos:safe])
+                pos = safe
+                break
+            self._current.feed(buffer[pos:stop])
+            trailer_end = buffer.find("\n", stop + len(self._end))
+            if trailer_end < 0:
+                if not final:
+                    pos = stop  # wait for the rest of the trailer
+                    break
+                trailer_end = len(buffer)
+            try:
+                end_index, rc = buffer[stop + len(self._end):trailer_end].split()
+                if int(end_index) == self._index:
+                    self.records[self._index] = (int(rc), self._current)
+            except ValueError:
+                pass
+            self._current = None
+            pos = trailer_end
+        self._buffer = buffer[max(0, pos):]
+        return False
+
+    def close(self) -> None:
+        """Handle output that ended without a trailing newline."""
+        self.feed("", final=True)
+
+
+def parse_output(output: str, marker: str) -> dict[int, tuple[int, str]]:
+    """Parse framed records back into ``{index: (rc, stdout)}``."""
+    reader = BatchReader(marker)
+    reader.feed(output)
+    reader.close()
+    return {index: (rc, window.text()) for index, (rc, window) in reader.records.items()}
@@ -0,0 +1,229 @@
+"""Result cache — reuse check outcomes while the files they read are unchanged."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shlex
+from pathlib import Path
+
+# Override with EXAMINER_CACHE_DIR; set EXAMINER_RESULT_CACHE=0 to disable
+CACHE_DIR = Path(
+    os.environ.get("EXAMINER_CACHE_DIR", Path.home() / ".cache" / "examiner")
+)
+
+# Commands whose outcome depends only on the files named in their arguments.
+# Anything else (rpm, systemctl, id, ansible-playbook, ...) reads state we
+# can't fingerprint cheaply and is never cached.
+_READERS = {
+    "test", "[", "grep", "egrep", "fgrep", "cat", "head", "tail",
+    "stat", "readlink", "wc", "md5sum", "sha256sum",
+}
+# Filters allowed after a pipe — they only transform the reader's output
+_FILTERS = {
+    "grep", "egrep", "fgrep", "wc", "head", "tail", "cut", "sort", "uniq", "tr",
+}
+_GREPS = {"grep", "egrep", "fgrep"}
+# Options that take the following argument (GNU short and long forms), so
+# it isn't mistaken for a pattern or file operand
+_HEAD_TAIL = {"-n", "-c", "--lines", "--bytes"}
+_OPTION_ARGS = {
+    **dict.fromkeys(_GREPS, {
+        "-e", "-f", "-m", "-A", "-B", "-C", "-d", "-D", "--regexp", "--file",
+        "--max-count", "--after-context", "--before-context", "--context",
+        "--directories", "--devices", "--label",
+    }),
+    "head": _HEAD_TAIL,
+    "tail": _HEAD_TAIL | {"-s", "--sleep-interval", "--pid"},
+    "stat": {"-c", "--format", "--printf"},
+    "cut": {"-b", "-c", "-d", "-f", "--bytes", "--characters", "--delimiter",
+            "--fields", "--output-delimiter"},
+    "sort": {"-k", "-t", "-o", "-S", "-T", "--key", "--field-separator",
+             "--output", "--buffer-size", "--temporary-directory"},
+    "uniq": {"-f", "-s", "-w", "--skip-fields", "--skip-chars", "--check-chars"},
+}
+# test/[ operators whose operand is a file
+_FILE_TESTS = {
+    "-b", "-c", "-d", "-e", "-f", "-g", "-G", "-h", "-k", "-L", "-N", "-O",
+    "-p", "-r", "-s", "-S", "-u", "-w", "-x",
+}
+_RECURSIVE_FLAGS = re.compile(r"^-[a-zA-Z]*[rR]|^--recursive$|^--dereference-recursive$")
+# Harmless redirections stripped before parsing
+_DEVNULL = re.compile(r"\s*(?:[12]?>\s*/dev/null|2>&1)")
+_GLOB = re.compile(r"[*?\[]")
+
+
+def _file_operands(command: str, args: list[str]) -> list[str]:
+    """The arguments of one pipeline stage that name files it reads."""
+    if command in ("test", "["):
+        return [b for a, b in zip(args, args[1:]) if a in _FILE_TESTS]
+    if command == "tr":
+        return []
+    takes = _OPTION_ARGS.get(command, set())
+    files: list[str] = []
+    operands: list[str] = []
+    pattern_given = False
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        if arg == "--":
+            operands += args[i:]
+            break
+        if not arg.startswith("-") or arg == "-":
+            operands.append(arg)
+            continue
+        name = value = None
+        if arg.startswith("--"):
+            name, eq, value = arg.partition("=")
+            if name not in takes:
+                continue
+            if not eq:
+                value = args[i] if i < len(args) else ""
+                i += 1
+        else:
+            # A cluster like -qA2 or -qe PATTERN: the first option that
+            # takes an argument ends it
+            for j, ch in enumerate(arg[1:], 2):
+                if "-" + ch in takes:
+                    name, value = "-" + ch, arg[j:]
+                    if not value:
+                        value = args[i] if i < len(args) else ""
+                        i += 1
+                    break
+        if command in _GREPS and name in ("-e", "--regexp", "-f", "--file"):
+            pattern_given = True
+            if name in ("-f", "--file"):
+                files.append(value)
+    if command in _GREPS and not pattern_given:
+        operands = operands[1:]
+    return files + [op for op in operands if op != "-"]
+
+
+def infer_paths(command: str) -> list[str] | None:
+    """Return the absolute paths a read-only command depends on.
+
+    Returns None when the command's result can't be tied to file state:
+    it isn't a plain reader pipeline, uses shell operators or expansion,
+    recurses into directories, names a file by a relative path or glob,
+    or names no file at all.
+    """
+    if "$" in command or "`" in command:
+        return None
+    lexer = shlex.shlex(_DEVNULL.sub("", command), posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+
+    segments: list[list[str]] = [[]]
+    for token in tokens:
+        if token == "|":
+            segments.append([])
+        elif token and set(token) <= set("&;<>|()"):
+            return None
+        else:
+            segments[-1].append(token)
+
+    paths: list[str] = []
+    for i, segment in enumerate(segments):
+        if not segment or segment[0] not in (_READERS if i == 0 else _FILTERS):
+            return None
+        if any(_RECURSIVE_FLAGS.match(arg) for arg in segment[1:]):
+            return None
+        for path in _file_operands(segment[0], segment[1:]):
+            # Relative paths depend on the working directory, which we
+            # don't fingerprint
+            if not path.startswith("/") or _GLOB.search(path):
+                return None
+            paths.append(path)
+    return sorted(set(paths)) or None
+
+
+def stat_script(paths: list[str]) -> str:
+    """Script printing one ``path<TAB>lstat<TAB>stat`` line per path.
+
+    Covers type, size, inode and nanosecond mtime/ctime (so chmod/chown
+    count as changes) for both the path itself and a symlink's target.
+    """
+    fmt = "%F|%s|%i|%y|%z"
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    return (
+        f"for p in {quoted}; do "
+        f"printf '%s\\t%s\\t%s\\n' \"$p\" "
+        f"\"$(stat -c '{fmt}' -- \"$p\" 2>/dev/null || echo absent)\" "
+        f"\"$(stat -L -c '{fmt}' -- \"$p\" 2>/dev/null || echo absent)\"; "
+        "done"
+    )
+
+
+def parse_stat_output(output: str) -> dict[str, str]:
+    """Parse ``stat_script`` output into ``{path: fingerprint}``."""
+    stats: dict[str, str] = {}
+    for line in output.splitlines():
+        path, sep, rest = line.partition("\t")
+        if sep:
+            stats[path] = rest
+    return stats
+
+
+class ResultCache:
+    """Per-exam store of (rc, stdout) outcomes keyed by node and command,
+    each tagged with the fingerprint of the files it depended on."""
+
+    VERSION = 1
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+
+    @classmethod
+    def for_exam(cls, exam_id: str) -> ResultCache:
+        cache = cls(CACHE_DIR / "results" / f"{exam_id}.json")
+        cache.load()
+        return cache
+
+    @staticmethod
+    def _key(node: str, command: str) -> str:
+        return f"{node}\t{command}"
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self._entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed (best effort)."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": self.VERSION, "entries": self._entries}))
+            tmp.replace(self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+    def lookup(self, node: str, command: str, fingerprint: str) -> tuple[int, str] | None:
+        """Return the cached (rc, stdout) if the fingerprint still matches."""
+        entry = self._entries.get(self._key(node, command))
+        if entry is None or entry.get("fp") != fingerprint:
+            return None
+        return entry["rc"], entry["stdout"]
+
+    def store(self, node: str, command: str, fingerprint: str, rc: int, stdout: str) -> None:
+        self._entries[self._key(node, command)] = {
+            "fp": fingerprint, "rc": rc, "stdout": stdout,
+        }
+        self._dirty = True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._dirty = True
@@ -0,0 +1,105 @@
+"""Bounded output capture — keep only the head and tail of long output.
+
+A check's stdout is held while it runs and then kept on its result for the
+rest of the session, so ``cat`` of a big file or a chatty
+``ansible-playbook`` run would otherwise stay resident in full. Output is
+read in chunks into an ``OutputWindow`` that keeps the first and last
+``MAX_OUTPUT / 2`` characters and, for ``expect_stdout_contains`` checks,
+notes whether the needle appeared anywhere — including the dropped middle.
+Checks that only assert the needle (``expect_rc: null``, no
+``expect_stdout``) can stop reading, and kill the command, once it appears.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+# Characters of stdout kept per check: half from the start, half from the end
+MAX_OUTPUT = 64 * 1024
+
+
+def _omitted(count: int) -> str:
+    return f"\n[... {count} characters omitted ...]\n"
+
+
+def clip(text: str, limit: int = MAX_OUTPUT) -> str:
+    """``text`` with everything but its first and last ``limit / 2``
+    characters replaced by an omission note."""
+    if len(text) <= limit:
+        return text
+    head = limit // 2
+    tail = limit - head
+    return text[:head] + _omitted(len(text) - limit) + text[-tail:]
+
+
+class OutputWindow:
+    """Streaming stdout capture bounded to ``limit`` characters (None:
+    keep everything), watching for ``needle`` — and any ``also`` substrings,
+    for other checks sharing the output — as output arrives."""
+
+    def __init__(
+        self,
+        limit: int | None = MAX_OUTPUT,
+        needle: str | None = None,
+        stop_at_needle: bool = False,
+        also: Iterable[str] = (),
+    ) -> None:
+        self.limit = limit
+        self.needle = needle or None
+        self.stop_at_needle = stop_at_needle
+        # Whether each watched substring has appeared so far
+        self.seen: dict[str, bool] = dict.fromkeys(
+            [n for n in (self.needle, *also) if n], False
+        )
+        self._longest = max(map(len, self.seen), default=0)
+        self._unseen = len(self.seen)
+        self._head: list[str] = []
+        self._head_room = limit // 2 if limit is not None else None
+        self._tail: deque[str] = deque()
+        self._tail_len = 0
+        self._dropped = 0
+        self._carry = ""  # end of the output so far, for needles split across chunks
+
+    @property
+    def found(self) -> bool:
+        """Whether ``needle`` has appeared."""
+        return self.needle is not None and self.seen[self.needle]
+
+    def feed(self, text: str) -> bool:
+        """Add a chunk of output. Returns True when the rest of the output
+        isn't needed: the needle was seen and ``stop_at_needle`` is set."""
+        if self._unseen:
+            scan = self._carry + text
+            for needle, seen in self.seen.items():
+                if not seen and needle in scan:
+                    self.seen[needle] = True
+                    self._unseen -= 1
+            self._carry = scan[max(0, len(scan) - self._longest + 1):]
+        if self._head_room is None:
+            self._head.append(text)
+            return self.found and self.stop_at_needle
+        if self._head_room:
+            taken = text[:self._head_room]
+            self._head.append(taken)
+            self._head_room -= len(taken)
+            text = text[len(taken):]
+        if text:
+            self._tail.append(text)
+            self._tail_len += len(text)
+            keep = self.limit - self.limit // 2
+            # Drop whole chunks that lie entirely before the tail window
+            while self._tail_len - len(self._tail[0]) >= keep:
+                self._tail_len -= len(self._tail[0])
+                self._dropped += len(self._tail.popleft())
+        return self.found and self.stop_at_needle
+
+    def text(self) -> str:
+        head = "".join(self._head)
+        if self.limit is None:
+            return head
+        tail = "".join(self._tail)
+        excess = len(tail) - (self.limit - self.limit // 2)
+        if excess > 0 or self._dropped:
+            return head + _omitted(self._dropped + max(0, excess)) + tail[max(0, excess):]
+        return head + tail
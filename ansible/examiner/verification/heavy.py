@@ -0,0 +1,125 @@
+"""Heavy commands — run Ansible tooling once per pass and share its output.
+
+``ansible-playbook --syntax-check``, ``ansible-vault view`` and friends each
+start a full Ansible Python process on the VM. Checks that run the same
+heavy command (often only to grep its output differently) are grouped:
+the heavy part runs once and each check's trailing ``| grep ...`` filters
+are applied locally to the shared stdout.
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+from dataclasses import dataclass, field
+
+from .snapshot import GrepStage, filter_output, parse_filters
+
+# Programs that start a full Ansible process
+HEAVY_TOOLS = {
+    "ansible", "ansible-playbook", "ansible-vault", "ansible-galaxy",
+    "ansible-inventory", "ansible-doc", "ansible-config", "ansible-navigator",
+    "ansible-lint", "ansible-console", "ansible-pull",
+}
+
+# Exit code the shared command uses to report that its leading ``cd``
+# failed, which the plain command would have reported as 1 with no output
+CD_FAILED_RC = 199
+
+_DEVNULL = re.compile(r"\s*2>\s*/dev/null")
+_COMMAND_START = re.compile(r"(?:^|&&|\|\||[;|(])\s*(?:sudo\s+)?(\S+)")
+
+
+def command_names(command: str) -> list[str]:
+    """The program each simple command in ``command`` runs (after sudo)."""
+    return [m.group(1) for m in _COMMAND_START.finditer(command)]
+
+
+def is_heavy(command: str) -> bool:
+    """True if any simple command in ``command`` runs an Ansible tool."""
+    return any(name in HEAVY_TOOLS for name in command_names(command))
+
+
+def _split_unquoted(command: str, op: str) -> list[str]:
+    """Split at unquoted occurrences of ``op`` ("|" never matches "||")."""
+    parts = []
+    quote = ""
+    start = i = 0
+    while i < len(command):
+        c = command[i]
+        if quote:
+            if c == quote:
+                quote = ""
+            elif c == "\\" and quote == '"':
+                i += 1
+        elif c in "'\"":
+            quote = c
+        elif c == "\\":
+            i += 1
+        elif command.startswith(op, i) and (
+            op != "|" or (command[i + 1:i + 2] != "|" and command[i - 1:i] != "|")
+        ):
+            parts.append(command[start:i])
+            start = i + len(op)
+            i = start
+            continue
+        i += 1
+    parts.append(command[start:])
+    return parts
+
+
+@dataclass
+class HeavyCommand:
+    """How one check's command maps onto a shared heavy run."""
+    key: str  # what actually runs on the VM, shared by every dependent
+    filters: list[GrepStage] = field(default_factory=list)  # applied locally
+
+    def apply(self, rc: int, stdout: str) -> tuple[int, str]:
+        """The check's own (rc, stdout), given the shared run's."""
+        if rc == CD_FAILED_RC:
+            return 1, ""
+        if not self.filters:
+            return rc, stdout
+        return filter_output(self.filters, rc, stdout)
+
+
+def split_heavy(command: str, marked: bool = False) -> HeavyCommand | None:
+    """Map a check command onto a shared heavy run, or None if it isn't heavy.
+
+    ``[cd DIR &&] TOOL ARGS [| grep ...]`` splits into the shared part and
+    local filters. Anything more involved — or a command the YAML merely
+    marked ``heavy`` — is shared only with checks running the exact same
+    command.
+    """
+    if not (marked or is_heavy(command)):
+        return None
+    whole = HeavyCommand(key=command)
+
+    pipeline = _split_unquoted(command, "|")
+    filters: list[GrepStage] = []
+    if len(pipeline) > 1:
+        filters = parse_filters("|".join(pipeline[1:])) or []
+        if not filters:
+            return whole
+    head = pipeline[0].strip()
+    if "||" in head or ";" in head or "$" in head or "`" in head:
+        return whole
+
+    steps = [s.strip() for s in _split_unquoted(head, "&&")]
+    cd = None
+    if len(steps) == 2:
+        try:
+            cd_argv = shlex.split(steps[0])
+        except ValueError:
+            return whole
+        if len(cd_argv) != 2 or cd_argv[0] != "cd":
+            return whole
+        cd = cd_argv[1]
+    elif len(steps) != 1:
+        return whole
+    tool = steps[-1]
+    if any(c in _DEVNULL.sub("", tool) for c in "&|;()<>"):
+        return whole
+
+    key = tool if cd is None else f"cd {shlex.quote(cd)} || exit {CD_FAILED_RC}\n{tool}"
+    return HeavyCommand(key=key, filters=filters)
@@ -0,0 +1,321 @@
+"""Native check types — assertions evaluated locally from bulk-gathered facts.
+
+Instead of one remote shell pipeline per check, the runner gathers what
+every typed check on a node needs in two round trips: one SFTP session that
+stats (and, for ``file_contains``, reads) each path, and one batch exec that
+runs a single ``rpm -q`` for all packages, ``getent group`` / ``getent
+passwd`` and a single ``systemctl show`` for all units. Each check is then
+decided in Python.
+
+Supported types and their YAML fields::
+
+    file_exists     path, state: present|absent|file|directory|link
+    file_contains   path, pattern (Python regex), state: present|absent
+    rpm_installed   package, state: present|absent
+    user_in_group   user, group, state: present|absent
+    service_state   service, active: bool, enabled: bool
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import shlex
+import stat as statmod
+from dataclasses import dataclass, field
+
+from ..lazy import lazy_import
+from ..models import Check, CheckTiming
+from .batch import build_script, parse_output
+from .ssh import COMMAND_TIMEOUT, SSHConnectionPool
+
+# Loaded on the first connection
+asyncssh = lazy_import("asyncssh")
+
+# Required fields per type; anything else is optional
+CHECK_TYPES: dict[str, tuple[str, ...]] = {
+    "file_exists": ("path",),
+    "file_contains": ("path", "pattern"),
+    "rpm_installed": ("package",),
+    "user_in_group": ("user", "group"),
+    "service_state": ("service",),
+}
+
+_STATES = {
+    "file_exists": ("present", "absent", "file", "directory", "link"),
+    "file_contains": ("present", "absent"),
+    "rpm_installed": ("present", "absent"),
+    "user_in_group": ("present", "absent"),
+}
+
+# file_contains reads at most this much of each file
+MAX_READ_BYTES = 1024 * 1024
+
+# UnitFileState values `systemctl is-enabled` reports as "enabled"
+_ENABLED_STATES = {"enabled", "enabled-runtime"}
+
+
+def validate_params(check_type: str, params: dict) -> dict:
+    """Check and normalise a typed check's fields; raise ValueError if bad."""
+    required = CHECK_TYPES.get(check_type)
+    if required is None:
+        raise ValueError(
+            f"unknown check type {check_type!r} "
+            f"(expected command or one of {', '.join(sorted(CHECK_TYPES))})"
+        )
+    missing = [name for name in required if name not in params]
+    if missing:
+        raise ValueError(f"{check_type} check needs {', '.join(missing)}")
+    params = dict(params)
+    for name in required:
+        params[name] = str(params[name])
+    if check_type in _STATES:
+        state = params.setdefault("state", "present")
+        if state not in _STATES[check_type]:
+            raise ValueError(
+                f"{check_type} state must be one of {', '.join(_STATES[check_type])}"
+            )
+    if check_type in ("file_exists", "file_contains") and not params["path"].startswith("/"):
+        raise ValueError(f"{check_type} path must be absolute")
+    if check_type == "file_contains":
+        try:
+            re.compile(params["pattern"], re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"bad pattern {params['pattern']!r}: {e}") from None
+    if check_type == "service_state":
+        if "active" not in params and "enabled" not in params:
+            params["active"] = True
+        for name in ("active", "enabled"):
+            if name in params and not isinstance(params[name], bool):
+                raise ValueError(f"service_state {name} must be true or false")
+    return params
+
+
+@dataclass
+class FileInfo:
+    """What SFTP saw at one path."""
+    kind: str | None = None  # file | directory | other; None when missing
+    is_link: bool = False
+    content: str | None = None  # only for file_contains paths
+    error: str | None = None
+
+
+@dataclass
+class NodeFacts:
+    """Everything the typed checks on one node are decided from."""
+    files: dict[str, FileInfo] = field(default_factory=dict)
+    packages: set[str] | None = None
+    # group name -> members, including users whose primary group it is
+    groups: dict[str, set[str]] | None = None
+    services: dict[str, dict[str, str]] | None = None
+    error: str | None = None  # why the shell sweep failed, if it did
+
+
+def _kind(attrs: asyncssh.SFTPAttrs) -> str:
+    mode = attrs.permissions or 0
+    if statmod.S_ISDIR(mode):
+        return "directory"
+    if statmod.S_ISREG(mode):
+        return "file"
+    return "other"
+
+
+async def _sftp_sweep(
+    sftp: asyncssh.SFTPClient, paths: list[str], read: set[str]
+) -> dict[str, FileInfo]:
+    async def one(path: str) -> tuple[str, FileInfo]:
+        info = FileInfo()
+        try:
+            info.is_link = statmod.S_ISLNK((await sftp.lstat(path)).permissions or 0)
+            info.kind = _kind(await sftp.stat(path) if info.is_link else await sftp.lstat(path))
+            if path in read and info.kind == "file":
+                async with sftp.open(path, "rb") as f:
+                    info.content = (await f.read(MAX_READ_BYTES)).decode(errors="replace")
+        except asyncssh.SFTPNoSuchFile:
+            pass  # missing, or a dangling symlink
+        except asyncssh.SFTPPermissionDenied:
+            info.error = f"Permission denied reading {path}"
+        except asyncssh.SFTPError as e:
+            info.error = f"{path}: {e.reason}"
+        return path, info
+
+    return dict(await asyncio.gather(*(one(path) for path in paths)))
+
+
+def _parse_groups(group_out: str, passwd_out: str) -> dict[str, set[str]]:
+    groups: dict[str, set[str]] = {}
+    by_gid: dict[str, str] = {}
+    for line in group_out.splitlines():
+        parts = line.split(":")
+        if len(parts) >= 4:
+            groups[parts[0]] = {m for m in parts[3].split(",") if m}
+            by_gid.setdefault(parts[2], parts[0])
+    for line in passwd_out.splitlines():
+        parts = line.split(":")
+        if len(parts) >= 4 and parts[3] in by_gid:
+            groups[by_gid[parts[3]]].add(parts[0])
+    return groups
+
+
+def _parse_systemctl(output: str, units: list[str]) -> dict[str, dict[str, str]]:
+    """`systemctl show` prints one blank-line-separated block per unit, in
+    argument order."""
+    blocks = [b for b in output.strip().split("\n\n") if b.strip()]
+    services: dict[str, dict[str, str]] = {}
+    for unit, block in zip(units, blocks):
+        props = {}
+        for line in block.splitlines():
+            name, _, value = line.partition("=")
+            props[name] = value
+        services[unit] = props
+    return services
+
+
+def _shell_commands(checks: list[Check]) -> tuple[list[str], list[str], list[str], bool]:
+    packages = sorted({c.params["package"] for c in checks if c.type == "rpm_installed"})
+    units = sorted({c.params["service"] for c in checks if c.type == "service_state"})
+    need_groups = any(c.type == "user_in_group" for c in checks)
+    commands = []
+    if packages:
+        commands.append(
+            "rpm -q --qf '%{NAME}\\n' " + " ".join(shlex.quote(p) for p in packages)
+        )
+    if need_groups:
+        commands += ["getent group", "getent passwd"]
+    if units:
+        commands.append(
+            "systemctl show --no-pager -p ActiveState,UnitFileState "
+            + " ".join(shlex.quote(u) for u in units)
+        )
+    return commands, packages, units, need_groups
+
+
+async def gather_facts(
+    pool: SSHConnectionPool,
+    host: str,
+    ip: str,
+    user: str,
+    checks: list[Check],
+    timing: CheckTiming,
+) -> NodeFacts:
+    """Collect the facts for every typed check on one node: one SFTP
+    session and one batch exec, run concurrently."""
+    facts = NodeFacts()
+    paths = sorted({c.params["path"] for c in checks if c.type in ("file_exists", "file_contains")})
+    read = {c.params["path"] for c in checks if c.type == "file_contains"}
+    commands, packages, units, need_groups = _shell_commands(checks)
+    timings: list[CheckTiming] = []
+
+    async def files() -> None:
+        t = CheckTiming()
+        timings.append(t)
+        try:
+            facts.files = await pool.run_sftp(
+                host, ip, lambda sftp: _sftp_sweep(sftp, paths, read), user, timing=t
+            )
+        except Exception as e:
+            facts.files = {p: FileInfo(error=f"SFTP failed: {e}") for p in paths}
+
+    async def shell() -> None:
+        t = CheckTiming()
+        timings.append(t)
+        try:
+            script, marker = build_script(commands, COMMAND_TIMEOUT)
+            _, output = await pool.run_command(
+                host, ip, script, user, timing=t, commands=len(commands),
+            )
+        except Exception as e:
+            facts.error = str(e)
+            return
+        records = parse_output(output, marker)
+        i = 0
+        if packages:
+            if i in records and records[i][0] != 127:  # 127: no rpm at all
+                # Missing ones print "package X is not installed" instead
+                lines = {line.strip() for line in records[i][1].splitlines()}
+                facts.packages = lines & set(packages)
+            i += 1
+        if need_groups:
+            if i in records and i + 1 in records:
+                facts.groups = _parse_groups(records[i][1], records[i + 1][1])
+            i += 2
+        if units and i in records:
+            facts.services = _parse_systemctl(records[i][1], units)
+
+    await asyncio.gather(
+        *([files()] if paths else []), *([shell()] if commands else [])
+    )
+    # Both sweeps ran side by side; report the slower one
+    timing.reused = all(t.reused for t in timings)
+    timing.connect = max((t.connect for t in timings), default=0.0)
+    timing.exec = max((t.exec for t in timings), default=0.0)
+    return facts
+
+
+def evaluate(check: Check, facts: NodeFacts) -> tuple[bool | None, str]:
+    """Decide a typed check. Returns (passed, message); ``passed`` is None
+    when the facts it needs couldn't be gathered."""
+    p = check.params
+    state = p.get("state", "present")
+    want = state != "absent"
+
+    if check.type in ("file_exists", "file_contains"):
+        info = facts.files.get(p["path"])
+        if info is None or info.error:
+            return None, info.error if info else f"{p['path']} was not checked"
+        if check.type == "file_exists":
+            if state == "link":
+                ok = info.is_link
+            elif state in ("file", "directory"):
+                ok = info.kind == state
+            else:
+                ok = (info.kind is not None) == want
+            found = "symlink" if info.is_link and state == "link" else info.kind or "missing"
+            return ok, f"{p['path']}: {found}" if ok else f"Expected {p['path']} {state}, found {found}"
+        if info.kind != "file":
+            return (not want), f"{p['path']} is not a readable file"
+        found = re.search(p["pattern"], info.content or "", re.MULTILINE) is not None
+        if found == want:
+            return True, f"{p['path']} {'matches' if found else 'does not match'} {p['pattern']!r}"
+        return False, (
+            f"{p['path']} does not match {p['pattern']!r}" if want
+            else f"{p['path']} unexpectedly matches {p['pattern']!r}"
+        )
+
+    if facts.error:
+        return None, facts.error
+
+    if check.type == "rpm_installed":
+        if facts.packages is None:
+            return None, "rpm query returned no result"
+        installed = p["package"] in facts.packages
+        if installed == want:
+            return True, f"{p['package']} {'is' if installed else 'is not'} installed"
+        return False, f"Package {p['package']} is {'not ' if want else ''}installed"
+
+    if check.type == "user_in_group":
+        if facts.groups is None:
+            return None, "getent returned no result"
+        if p["group"] not in facts.groups:
+            return (not want), f"Group {p['group']} does not exist"
+        member = p["user"] in facts.groups[p["group"]]
+        if member == want:
+            return True, f"{p['user']} {'is' if member else 'is not'} in {p['group']}"
+        return False, f"User {p['user']} is {'not ' if want else ''}in group {p['group']}"
+
+    if check.type == "service_state":
+        props = (facts.services or {}).get(p["service"])
+        if props is None:
+            return None, "systemctl returned no result"
+        active = props.get("ActiveState", "unknown")
+        enabled = props.get("UnitFileState", "") or "unknown"
+        problems = []
+        if "active" in p and (active == "active") != p["active"]:
+            problems.append(f"{'active' if p['active'] else 'inactive'} expected, got {active}")
+        if "enabled" in p and (enabled in _ENABLED_STATES) != p["enabled"]:
+            problems.append(f"{'enabled' if p['enabled'] else 'disabled'} expected, got {enabled}")
+        if problems:
+            return False, f"{p['service']}: " + "; ".join(problems)
+        return True, f"{p['service']}: {active}, {enabled}"
+
+    return None, f"Unknown check type {check.type}"
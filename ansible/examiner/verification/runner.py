@@ -2,16 +2,126 @@
 
 from __future__ import annotations
 
-from ..models import Check, CheckResult, CheckStatus, Exam, Task
-from .ssh import SSHConnectionPool
+import asyncio
+import dataclasses
+import os
+import time
+from typing import Awaitable, Callable, Iterable
+
+from ..models import Check, CheckResult, CheckStatus, CheckTiming, Exam, Task
+from .batch import TIMEOUT_RC, BatchReader, build_script
+from .capture import MAX_OUTPUT, OutputWindow, clip
+from .cache import ResultCache, infer_paths, parse_stat_output, stat_script
+from .heavy import HeavyCommand, split_heavy
+from .native import evaluate as evaluate_native, gather_facts
+from .snapshot import FileSnapshot, GrepStage, Unsupported, parse_command, run_pipeline
+from .ssh import COMMAND_TIMEOUT, SSHConnectionPool
+
+# Parallel channels per node (sshd's MaxSessions defaults to 10) and overall.
+# Override with EXAMINER_NODE_CONCURRENCY / EXAMINER_CONCURRENCY env vars.
+NODE_CONCURRENCY = 4
+GLOBAL_CONCURRENCY = 16
+
+# Heavy commands (ansible-playbook, ansible-vault, ...) allowed to run at
+# once per node, so a full pass doesn't pin the control VM's CPU. Override
+# with EXAMINER_HEAVY_CONCURRENCY.
+HEAVY_CONCURRENCY = 2
+
+# Batch mode packs up to this many of a node's checks into one remote
+# script. Disable with EXAMINER_BATCH=0.
+BATCH_SIZE = 25
+
+# grep/cat checks are evaluated from an SFTP file snapshot; disable with
+# EXAMINER_SNAPSHOT=0.
+
+# Called after each check finishes: (task, check, result)
+ResultCallback = Callable[[Task, Check, CheckResult], None]
+
+
+def _stops_early(check: Check) -> bool:
+    """True if seeing the expected substring settles the check, so its
+    command can be killed as soon as that appears (no exit code needed)."""
+    return (
+        check.expect_rc is None
+        and check.expect_stdout is None
+        and bool(check.expect_stdout_contains)
+    )
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def global_limit(global_concurrency: int | None = None) -> asyncio.Semaphore:
+    """A global cap on running checks for several runners to share, e.g.
+    one per lab environment (see ``VerificationRunner``'s ``global_sem``)."""
+    return asyncio.Semaphore(
+        global_concurrency or _env_int("EXAMINER_CONCURRENCY", GLOBAL_CONCURRENCY)
+    )
 
 
 class VerificationRunner:
     """Runs verification checks over SSH and records results."""
 
-    def __init__(self, pool: SSHConnectionPool, exam: Exam) -> None:
+    def __init__(
+        self,
+        pool: SSHConnectionPool,
+        exam: Exam,
+        node_concurrency: int | None = None,
+        global_concurrency: int | None = None,
+        batch: bool | None = None,
+        batch_size: int = BATCH_SIZE,
+        cache: ResultCache | None = None,
+        snapshot: bool | None = None,
+        heavy_concurrency: int | None = None,
+        global_sem: asyncio.Semaphore | None = None,
+    ) -> None:
         self.pool = pool
         self.exam = exam
+        pool.add_routes(exam.hosts)
+        self.cache = cache
+        self.node_concurrency = node_concurrency or _env_int(
+            "EXAMINER_NODE_CONCURRENCY", NODE_CONCURRENCY
+        )
+        self.global_concurrency = global_concurrency or _env_int(
+            "EXAMINER_CONCURRENCY", GLOBAL_CONCURRENCY
+        )
+        if batch is None:
+            batch = os.environ.get("EXAMINER_BATCH", "1") != "0"
+        self.batch = batch
+        self.batch_size = max(1, batch_size)
+        if snapshot is None:
+            snapshot = os.environ.get("EXAMINER_SNAPSHOT", "1") != "0"
+        # Kept for the runner's lifetime so unchanged files aren't re-read
+        self.snapshot = FileSnapshot() if snapshot else None
+        self._pipelines: dict[str, list[GrepStage] | None] = {}
+        self._heavy_splits: dict[tuple[str, bool], HeavyCommand | None] = {}
+        self.heavy_concurrency = heavy_concurrency or _env_int(
+            "EXAMINER_HEAVY_CONCURRENCY", HEAVY_CONCURRENCY
+        )
+        # A shared global_sem caps this runner together with the others
+        # using it, in place of global_concurrency
+        self._global_sem = global_sem or asyncio.Semaphore(self.global_concurrency)
+        self._node_sems: dict[str, asyncio.Semaphore] = {}
+        self._heavy_sems: dict[str, asyncio.Semaphore] = {}
+        # Heavy runs in progress, keyed by (node, command), so overlapping
+        # passes share one run too
+        self._heavy_runs: dict[tuple[str, str], asyncio.Future] = {}
+
+    def _node_sem(self, node_name: str) -> asyncio.Semaphore:
+        sem = self._node_sems.get(node_name)
+        if sem is None:
+            sem = self._node_sems[node_name] = asyncio.Semaphore(self.node_concurrency)
+        return sem
+
+    def _heavy_sem(self, node_name: str) -> asyncio.Semaphore:
+        sem = self._heavy_sems.get(node_name)
+        if sem is None:
+            sem = self._heavy_sems[node_name] = asyncio.Semaphore(self.heavy_concurrency)
+        return sem
 
     def _resolve_ip(self, node_name: str) -> str:
         """Look up the IP for a node from the exam host definitions."""
@@ -26,60 +136,635 @@ class VerificationRunner:
             return "vagrant"
         return host.ssh_user
 
-    async def verify_check(self, check: Check, result: CheckResult) -> None:
-        """Run a single check and update the result in-place."""
+    def _evaluate(
+        self,
+        check: Check,
+        result: CheckResult,
+        rc: int | None,
+        stdout: str,
+        found: bool | None = None,
+    ) -> None:
+        """Record a command outcome on the result and assert expectations.
+
+        ``found`` says whether expect_stdout_contains appeared anywhere in
+        the output, for output that was captured through a bounded window.
+        Only the head and tail of long output are kept on the result.
+        """
+        stdout = stdout.strip()
+        result.actual_rc = rc
+        # Output read through a window (``found`` given) is already bounded
+        result.actual_stdout = stdout if found is not None else clip(stdout)
+
+        # Evaluate — all conditions must pass
+        passed = True
+
+        if check.expect_rc is not None:
+            if rc != check.expect_rc:
+                passed = False
+                result.error_message = (
+                    f"Expected rc={check.expect_rc}, got {rc}"
+                )
+
+        if passed and check.expect_stdout is not None:
+            if stdout != check.expect_stdout.strip():
+                passed = False
+                result.error_message = (
+                    f"Expected stdout '{check.expect_stdout.strip()}', "
+                    f"got '{result.actual_stdout}'"
+                )
+
+        if passed and check.expect_stdout_contains is not None:
+            if found is None:
+                found = check.expect_stdout_contains in stdout
+            if not found:
+                passed = False
+                result.error_message = (
+                    f"stdout missing '{check.expect_stdout_contains}'"
+                )
+
+        result.status = CheckStatus.PASSED if passed else CheckStatus.FAILED
+
+    async def verify_check(
+        self, check: Check, result: CheckResult, watch: dict[str, bool] | None = None
+    ) -> None:
+        """Run a single check and update the result in-place.
+
+        ``watch`` maps substrings other checks sharing this output expect;
+        each is set to whether it appeared anywhere in the output, including
+        any part too long to keep.
+        """
         result.status = CheckStatus.RUNNING
         result.error_message = None
+        result.timing = timing = CheckTiming()
         try:
             ip = self._resolve_ip(check.node)
             user = self._resolve_user(check.node)
-            rc, stdout = await self.pool.run_command(
-                check.node, ip, check.command, user
+            needle = check.expect_stdout_contains
+            stop = _stops_early(check)
+            rc, window = await self.pool.stream_command(
+                check.node, ip, check.command,
+                lambda: OutputWindow(needle=needle, stop_at_needle=stop, also=watch or ()),
+                user, timing=timing,
             )
-            result.actual_rc = rc
-            result.actual_stdout = stdout.strip()
+            if watch is not None:
+                watch.update(window.seen)
+            self._evaluate(check, result, rc, window.text(), window.found)
 
-            # Evaluate — all conditions must pass
-            passed = True
+        except Exception as e:
+            result.status = CheckStatus.ERROR
+            result.error_message = str(e)
 
-            if check.expect_rc is not None:
-                if rc != check.expect_rc:
-                    passed = False
-                    result.error_message = (
-                        f"Expected rc={check.expect_rc}, got {rc}"
-                    )
+    async def verify_batch(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None = None,
+        watches: dict[int, dict[str, bool]] | None = None,
+    ) -> None:
+        """Run several checks on one node in a single remote exec.
 
-            if passed and check.expect_stdout is not None:
-                if result.actual_stdout != check.expect_stdout.strip():
-                    passed = False
+        ``watches`` holds, by index in ``items``, a ``watch`` map as taken
+        by ``verify_check`` for that item's output.
+        """
+        watches = watches or {}
+        timing = CheckTiming(source="batch")
+        for _, _, result in items:
+            result.status = CheckStatus.RUNNING
+            result.error_message = None
+            result.timing = timing
+        try:
+            ip = self._resolve_ip(node)
+            user = self._resolve_user(node)
+            script, marker = build_script(
+                [check.command for _, check, _ in items], COMMAND_TIMEOUT
+            )
+
+            def new_reader() -> BatchReader:
+                return BatchReader(
+                    marker,
+                    lambda i: OutputWindow(
+                        needle=items[i][1].expect_stdout_contains, also=watches.get(i, ())
+                    ),
+                )
+
+            # Commands run back to back; the timeout applies to each
+            _, reader = await self.pool.stream_command(
+                node, ip, script, new_reader, user,
+                timing=timing, commands=len(items),
+            )
+            reader.close()
+            records = reader.records
+            for i, (_, check, result) in enumerate(items):
+                record = records.get(i)
+                if record is None:
+                    result.status = CheckStatus.ERROR
+                    result.error_message = "No result returned from batch"
+                elif record[0] == TIMEOUT_RC:
+                    result.status = CheckStatus.ERROR
                     result.error_message = (
-                        f"Expected stdout '{check.expect_stdout.strip()}', "
-                        f"got '{result.actual_stdout}'"
+                        f"Command timed out after {COMMAND_TIMEOUT}s"
                     )
+                else:
+                    rc, window = record
+                    if i in watches:
+                        watches[i].update(window.seen)
+                    self._evaluate(check, result, rc, window.text(), window.found)
+        except Exception as e:
+            for _, _, result in items:
+                result.status = CheckStatus.ERROR
+                result.error_message = str(e)
+        # Every check in the batch gets its own copy of the shared numbers
+        for _, _, result in items:
+            result.timing = dataclasses.replace(timing)
+        if on_result is not None:
+            for task, check, result in items:
+                on_result(task, check, result)
 
-            if passed and check.expect_stdout_contains is not None:
-                if check.expect_stdout_contains not in (result.actual_stdout or ""):
-                    passed = False
-                    result.error_message = (
-                        f"stdout missing '{check.expect_stdout_contains}'"
+    async def verify_native(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None = None,
+    ) -> None:
+        """Decide every typed check on one node from one bulk fact sweep."""
+        timing = CheckTiming(source="native")
+        for _, _, result in items:
+            result.status = CheckStatus.RUNNING
+            result.error_message = None
+            result.timing = timing
+        try:
+            facts = await gather_facts(
+                self.pool, node, self._resolve_ip(node), self._resolve_user(node),
+                [check for _, check, _ in items], timing,
+            )
+            for _, check, result in items:
+                passed, message = evaluate_native(check, facts)
+                result.actual_rc = None if passed is None else int(not passed)
+                result.actual_stdout = message if passed else None
+                result.error_message = None if passed else message
+                result.status = (
+                    CheckStatus.ERROR if passed is None
+                    else CheckStatus.PASSED if passed else CheckStatus.FAILED
+                )
+        except Exception as e:
+            for _, _, result in items:
+                result.status = CheckStatus.ERROR
+                result.error_message = str(e)
+        for _, _, result in items:
+            result.timing = dataclasses.replace(timing)
+        if on_result is not None:
+            for task, check, result in items:
+                on_result(task, check, result)
+
+    def _heavy_split(self, check: Check) -> HeavyCommand | None:
+        key = (check.command, check.heavy)
+        if key not in self._heavy_splits:
+            self._heavy_splits[key] = split_heavy(check.command, check.heavy)
+        return self._heavy_splits[key]
+
+    def _pipeline(self, command: str) -> list[GrepStage] | None:
+        if command not in self._pipelines:
+            self._pipelines[command] = parse_command(command)
+        return self._pipelines[command]
+
+    async def verify_snapshot(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None = None,
+    ) -> list[tuple[Task, Check, CheckResult]]:
+        """Evaluate grep/cat checks on one node from the file snapshot.
+
+        Returns the items the snapshot couldn't reproduce, which still have
+        to run on the VM.
+        """
+        timing = CheckTiming(source="snapshot")
+        for _, _, result in items:
+            result.status = CheckStatus.RUNNING
+            result.error_message = None
+        operands = sorted({
+            path
+            for _, check, _ in items
+            for path in self._pipeline(check.command)[0].paths
+        })
+        try:
+            ip = self._resolve_ip(node)
+            files, snap = await self.pool.run_sftp(
+                node, ip,
+                lambda sftp: self.snapshot.refresh(sftp, f"{node}@{ip}", operands),
+                self._resolve_user(node),
+                timing=timing,
+            )
+        except Exception:
+            return items
+
+        remote = []
+        for item in items:
+            _, check, result = item
+            try:
+                rc, stdout = run_pipeline(self._pipeline(check.command), files, snap)
+            except Unsupported:
+                remote.append(item)
+                continue
+            result.timing = dataclasses.replace(timing)
+            self._evaluate(check, result, rc, stdout)
+            if on_result is not None:
+                on_result(*item)
+        return remote
+
+    async def _verify_limited(
+        self,
+        task: Task,
+        check: Check,
+        result: CheckResult,
+        on_result: ResultCallback | None,
+        watch: dict[str, bool] | None = None,
+    ) -> None:
+        start = time.perf_counter()
+        # Take the node slot first so a busy node doesn't hold global slots
+        async with self._node_sem(check.node), self._global_sem:
+            await self.verify_check(check, result, watch)
+        result.timing.total = time.perf_counter() - start
+        if on_result is not None:
+            on_result(task, check, result)
+
+    async def _verify_batch_limited(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None,
+        watches: dict[int, dict[str, bool]] | None = None,
+    ) -> None:
+        start = time.perf_counter()
+
+        def timed(task: Task, check: Check, result: CheckResult) -> None:
+            result.timing.total = time.perf_counter() - start
+            if on_result is not None:
+                on_result(task, check, result)
+
+        async with self._node_sem(node), self._global_sem:
+            await self.verify_batch(node, items, timed, watches)
+
+    async def _verify_native_limited(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None,
+    ) -> None:
+        start = time.perf_counter()
+
+        def timed(task: Task, check: Check, result: CheckResult) -> None:
+            result.timing.total = time.perf_counter() - start
+            if on_result is not None:
+                on_result(task, check, result)
+
+        async with self._node_sem(node), self._global_sem:
+            await self.verify_native(node, items, timed)
+
+    async def _verify_snapshot_limited(
+        self,
+        node: str,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None,
+    ) -> None:
+        start = time.perf_counter()
+
+        def timed(task: Task, check: Check, result: CheckResult) -> None:
+            result.timing.total = time.perf_counter() - start
+            if on_result is not None:
+                on_result(task, check, result)
+
+        async with self._node_sem(node), self._global_sem:
+            remote = await self.verify_snapshot(node, items, timed)
+        if remote:
+            await asyncio.gather(*self._remote_jobs(remote, on_result))
+
+    async def _run_heavy(self, node: str, command: str) -> tuple[int, str, CheckTiming]:
+        """Run a heavy command once, however many passes ask for it at once."""
+        key = (node, command)
+        run = self._heavy_runs.get(key)
+        if run is None:
+
+            async def execute() -> tuple[int, str, CheckTiming]:
+                timing = CheckTiming()
+                async with self._heavy_sem(node), self._node_sem(node), self._global_sem:
+                    rc, stdout = await self.pool.run_command(
+                        node, self._resolve_ip(node), command,
+                        self._resolve_user(node), timing=timing,
                     )
+                return rc, stdout, timing
 
-            result.status = CheckStatus.PASSED if passed else CheckStatus.FAILED
+            run = self._heavy_runs[key] = asyncio.ensure_future(execute())
+            run.add_done_callback(lambda _: self._heavy_runs.pop(key, None))
+        # Shielded: one caller being cancelled mustn't cancel the others
+        return await asyncio.shield(run)
 
+    async def verify_heavy(
+        self,
+        node: str,
+        command: str,
+        items: list[tuple[Task, Check, CheckResult, HeavyCommand]],
+        on_result: ResultCallback | None = None,
+    ) -> None:
+        """Run one heavy command and evaluate every check that depends on it."""
+        start = time.perf_counter()
+        for _, _, result, _ in items:
+            result.status = CheckStatus.RUNNING
+            result.error_message = None
+        try:
+            rc, stdout, timing = await self._run_heavy(node, command)
         except Exception as e:
+            for task, check, result, _ in items:
+                result.status = CheckStatus.ERROR
+                result.error_message = str(e)
+                result.timing = CheckTiming(total=time.perf_counter() - start)
+                if on_result is not None:
+                    on_result(task, check, result)
+            return
+        for i, (task, check, result, heavy) in enumerate(items):
+            result.timing = dataclasses.replace(
+                timing,
+                total=time.perf_counter() - start,
+                source="exec" if i == 0 else "shared",
+            )
+            self._evaluate(check, result, *heavy.apply(rc, stdout))
+            if on_result is not None:
+                on_result(task, check, result)
+
+    async def _stat_sweep(self, node: str, paths: list[str]) -> dict[str, str]:
+        """Fingerprint the given paths on a node in one exec."""
+        try:
+            async with self._node_sem(node), self._global_sem:
+                _, output = await self.pool.run_command(
+                    node, self._resolve_ip(node), stat_script(paths),
+                    self._resolve_user(node),
+                )
+        except Exception:
+            return {}
+        return parse_stat_output(output)
+
+    async def _fingerprint(
+        self, items: list[tuple[Task, Check, CheckResult]]
+    ) -> dict[int, str]:
+        """Fingerprint the files each cacheable check reads, keyed by
+        ``id(check)``, with one stat sweep per node."""
+        wanted: dict[str, set[str]] = {}
+        check_paths: dict[int, tuple[str, list[str]]] = {}
+        for _, check, _ in items:
+            if check.type != "command":
+                continue
+            paths = infer_paths(check.command)
+            if paths:
+                check_paths[id(check)] = (check.node, paths)
+                wanted.setdefault(check.node, set()).update(paths)
+        if not wanted:
+            return {}
+
+        nodes = list(wanted)
+        sweeps = await asyncio.gather(
+            *(self._stat_sweep(node, sorted(wanted[node])) for node in nodes)
+        )
+        stats = dict(zip(nodes, sweeps))
+        fingerprints: dict[int, str] = {}
+        for key, (node, paths) in check_paths.items():
+            node_stats = stats[node]
+            if all(p in node_stats for p in paths):
+                fingerprints[key] = "\n".join(f"{p}\t{node_stats[p]}" for p in paths)
+        return fingerprints
+
+    @staticmethod
+    def _plan(
+        items: list[tuple[Task, Check, CheckResult]],
+    ) -> tuple[
+        list[tuple[Task, Check, CheckResult]],
+        dict[int, list[tuple[Task, Check, CheckResult]]],
+    ]:
+        """Build the execution plan: one item per unique (node, command).
+
+        Returns the items to run and, keyed by ``id()`` of each lead
+        result, the duplicate items that will share its outcome.
+        """
+        leads: dict[tuple[str, str, str | None], CheckResult] = {}
+        unique: list[tuple[Task, Check, CheckResult]] = []
+        followers: dict[int, list[tuple[Task, Check, CheckResult]]] = {}
+        for item in items:
+            _, check, result = item
+            # A run cut short at its needle only settles checks with that needle
+            key = (
+                check.node, check.command,
+                check.expect_stdout_contains if _stops_early(check) else None,
+            )
+            lead = leads.get(key)
+            if lead is None:
+                leads[key] = result
+                unique.append(item)
+            else:
+                result.status = CheckStatus.RUNNING
+                result.error_message = None
+                followers.setdefault(id(lead), []).append(item)
+        return unique, followers
+
+    def _share(
+        self,
+        source: CheckResult,
+        check: Check,
+        result: CheckResult,
+        watch: dict[str, bool] | None = None,
+    ) -> None:
+        """Apply another check's outcome for the same command to ``check``.
+
+        ``watch`` is the lead's ``verify_check`` watch map: whether each
+        expected substring appeared in the full output, which may be longer
+        than the ``actual_stdout`` kept on ``source``.
+        """
+        if source.timing is not None:
+            result.timing = dataclasses.replace(source.timing, source="shared")
+        if source.status == CheckStatus.ERROR:
+            result.actual_rc = source.actual_rc
+            result.actual_stdout = source.actual_stdout
+            result.error_message = source.error_message
             result.status = CheckStatus.ERROR
-            result.error_message = str(e)
+        else:
+            stdout = source.actual_stdout or ""
+            needle = check.expect_stdout_contains
+            if watch and needle in watch:
+                found = watch[needle]
+            else:
+                found = bool(needle) and needle in stdout
+            # Passing ``found`` also keeps the already bounded stdout as is
+            self._evaluate(check, result, source.actual_rc, stdout, found)
+
+    def _remote_jobs(
+        self,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None,
+    ) -> list[Awaitable[None]]:
+        """Jobs that run command checks on the VMs: one per unique command,
+        or one per batch of up to ``batch_size`` commands on a node."""
+        unique, followers = self._plan(items)
+        # Followers' substrings are looked for in the lead's full output,
+        # since only its head and tail are kept
+        watches: dict[int, dict[str, bool]] = {}
+        for lead, group in followers.items():
+            needles = [c.expect_stdout_contains for _, c, _ in group if c.expect_stdout_contains]
+            if needles:
+                watches[lead] = dict.fromkeys(needles, False)
+
+        def finished(task: Task, check: Check, result: CheckResult) -> None:
+            if on_result is not None:
+                on_result(task, check, result)
+            for item in followers.get(id(result), ()):
+                self._share(result, item[1], item[2], watches.get(id(result)))
+                if on_result is not None:
+                    on_result(*item)
+
+        jobs = []
+        by_node: dict[str, list[tuple[Task, Check, CheckResult]]] = {}
+        for task, check, result in unique:
+            # Checks that can stop early get their own exec so they can be killed
+            if self.batch and not _stops_early(check):
+                by_node.setdefault(check.node, []).append((task, check, result))
+            else:
+                jobs.append(self._verify_limited(
+                    task, check, result, finished, watches.get(id(result))
+                ))
+        for node, node_items in by_node.items():
+            for i in range(0, len(node_items), self.batch_size):
+                chunk = node_items[i:i + self.batch_size]
+                chunk_watches = {
+                    j: watches[id(result)]
+                    for j, (_, _, result) in enumerate(chunk)
+                    if id(result) in watches
+                }
+                jobs.append(self._verify_batch_limited(node, chunk, finished, chunk_watches))
+        return jobs
 
-    async def verify_task(self, task: Task) -> None:
-        """Run all checks for a task sequentially."""
-        task.init_results()
-        for check, result in zip(task.checks, task.results):
-            await self.verify_check(check, result)
+    async def verify_tasks(
+        self,
+        tasks: Iterable[Task],
+        on_result: ResultCallback | None = None,
+        force: bool = False,
+    ) -> None:
+        """Run every check of the given tasks concurrently.
 
-    async def verify_all(self) -> None:
+        Parallelism is capped per node and globally; ``on_result`` fires as
+        each check completes, in completion order. In batch mode each node's
+        checks are grouped into scripts of up to ``batch_size`` commands.
+        Each unique (node, command) runs once per pass; its outcome is
+        evaluated against every check that shares it. Typed checks are
+        decided from one fact sweep per node. Heavy Ansible commands run
+        once per pass under their own per-node limit, with their output
+        shared by every check that uses them. grep/cat checks are decided
+        from one file snapshot per node, falling back to running them when
+        the snapshot can't reproduce them. With a cache, checks whose files
+        are unchanged reuse their previous outcome unless ``force`` is set.
+        """
+        items: list[tuple[Task, Check, CheckResult]] = []
+        for task in tasks:
+            task.init_results()
+            items.extend(
+                (task, check, result)
+                for check, result in zip(task.checks, task.results)
+            )
+        await self._verify_items(items, on_result, force)
+
+    async def verify_checks(
+        self,
+        checks: Iterable[tuple[Task, Check]],
+        on_result: ResultCallback | None = None,
+        force: bool = False,
+    ) -> None:
+        """Run just the given checks, scheduled the same way as
+        ``verify_tasks``; other results of their tasks are left alone."""
+        items: list[tuple[Task, Check, CheckResult]] = []
+        for task, check in checks:
+            task.init_results()
+            i = next(i for i, c in enumerate(task.checks) if c is check)
+            items.append((task, check, task.results[i]))
+        await self._verify_items(items, on_result, force)
+
+    async def _verify_items(
+        self,
+        items: list[tuple[Task, Check, CheckResult]],
+        on_result: ResultCallback | None,
+        force: bool,
+    ) -> None:
+        fingerprints: dict[int, str] = {}
+        if self.cache is not None:
+            fingerprints = await self._fingerprint(items)
+            if not force:
+                pending = []
+                for item in items:
+                    _, check, result = item
+                    fp = fingerprints.get(id(check))
+                    hit = fp and self.cache.lookup(check.node, check.command, fp)
+                    if hit:
+                        result.error_message = None
+                        result.timing = CheckTiming(source="cache")
+                        self._evaluate(check, result, *hit)
+                        if on_result is not None:
+                            on_result(*item)
+                    else:
+                        pending.append(item)
+                items = pending
+
+        native: dict[str, list[tuple[Task, Check, CheckResult]]] = {}
+        heavy: dict[tuple[str, str], list[tuple[Task, Check, CheckResult, HeavyCommand]]] = {}
+        snapshot: dict[str, list[tuple[Task, Check, CheckResult]]] = {}
+        remote: list[tuple[Task, Check, CheckResult]] = []
+        for item in items:
+            check = item[1]
+            if check.type != "command":
+                native.setdefault(check.node, []).append(item)
+            elif (split := self._heavy_split(check)) is not None:
+                # Run to completion even if the check could stop early: the
+                # output is shared, and a killed playbook leaves a half-done VM
+                heavy.setdefault((check.node, split.key), []).append((*item, split))
+            elif self.snapshot is not None and self._pipeline(check.command):
+                snapshot.setdefault(check.node, []).append(item)
+            else:
+                remote.append(item)
+
+        jobs = [
+            self._verify_native_limited(node, node_items, on_result)
+            for node, node_items in native.items()
+        ]
+        jobs.extend(
+            self.verify_heavy(node, command, heavy_items, on_result)
+            for (node, command), heavy_items in heavy.items()
+        )
+        jobs.extend(
+            self._verify_snapshot_limited(node, node_items, on_result)
+            for node, node_items in snapshot.items()
+        )
+        jobs.extend(self._remote_jobs(remote, on_result))
+        await asyncio.gather(*jobs)
+
+        if self.cache is not None:
+            for _, check, result in items:
+                fp = fingerprints.get(id(check))
+                if (
+                    fp
+                    and result.status in (CheckStatus.PASSED, CheckStatus.FAILED)
+                    and len(result.actual_stdout or "") <= MAX_OUTPUT  # not clipped
+                ):
+                    self.cache.store(
+                        check.node, check.command, fp,
+                        result.actual_rc, result.actual_stdout or "",
+                    )
+            self.cache.save()
+
+    async def verify_task(
+        self, task: Task, on_result: ResultCallback | None = None, force: bool = False
+    ) -> None:
+        """Run all checks for a task concurrently."""
+        await self.verify_tasks([task], on_result, force)
+
+    async def verify_all(
+        self, on_result: ResultCallback | None = None, force: bool = False
+    ) -> None:
         """Run verification for every task."""
-        for task in self.exam.tasks:
-            await self.verify_task(task)
+        await self.verify_tasks(self.exam.tasks, on_result, force)
 
     def reset_task(self, task: Task) -> None:
         """Reset all results for a task to PENDING."""
@@ -88,6 +773,7 @@ class VerificationRunner:
             result.actual_rc = None
             result.actual_stdout = None
             result.error_message = None
+            result.timing = None
 
     def reset_all(self) -> None:
         """Reset all tasks."""
@@ -0,0 +1,521 @@
+"""File snapshot — evaluate grep/cat checks locally from files fetched over SFTP.
+
+Many checks read the same few files (ansible.cfg, inventory, repo files)
+with ``grep`` or ``cat``. Rather than one remote process per check, the
+runner fetches every file those checks name once per node per pass, in one
+SFTP session, and replays the commands here with compiled regexes. Contents
+are kept between passes and re-read only when a file's mtime or size
+changes.
+
+Only commands whose output can be reproduced exactly are taken over: a
+``cat`` of absolute paths, or a ``grep`` with a small set of options,
+optionally piped into further ``grep`` filters. Patterns are translated
+from POSIX BRE/ERE conservatively — anything without a clear Python
+equivalent (back-references, most GNU escapes) leaves the check to run
+remotely, as do unreadable, binary or oversized files.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import shlex
+import stat as statmod
+from dataclasses import dataclass
+
+from ..lazy import lazy_import
+
+# Loaded on the first connection
+asyncssh = lazy_import("asyncssh")
+
+# Larger files are left to the remote command
+MAX_SNAPSHOT_BYTES = 1024 * 1024
+
+# SFTP mtimes are whole seconds, so a same-size rewrite within a second of
+# a read looks unchanged. Cached text is only reused if the file's mtime
+# was at least this many seconds old (by the remote clock) when it was read.
+_SETTLE = 2
+
+# Only stdout is captured, so discarding stderr changes nothing
+_DEVNULL = re.compile(r"\s*2>\s*/dev/null")
+_GLOB = re.compile(r"[*?\[]")
+
+# POSIX bracket classes with a plain Python equivalent
+_CLASSES = {
+    "alpha": "a-zA-Z",
+    "digit": "0-9",
+    "alnum": "a-zA-Z0-9",
+    "upper": "A-Z",
+    "lower": "a-z",
+    "space": " \\t\\n\\r\\f\\v",
+    "blank": " \\t",
+    "xdigit": "0-9A-Fa-f",
+}
+
+# GNU escapes and their Python re equivalents (\< and \> only match at
+# the start and end of a word, not at any word boundary)
+_SAME_ESCAPES = {
+    "w": "\\w", "W": "\\W", "s": "\\s", "S": "\\S",
+    "b": "\\b", "B": "\\B", "<": "\\b(?=\\w)", ">": "\\b(?<=\\w)",
+}
+
+
+class Unsupported(Exception):
+    """The command can't be reproduced locally; run it remotely."""
+
+
+def translate_pattern(pattern: str, extended: bool) -> str:
+    """Translate a POSIX BRE (or ERE) into an equivalent Python regex.
+
+    Raises Unsupported for anything not clearly equivalent.
+    """
+    out: list[str] = []
+    i = 0
+    n = len(pattern)
+    # Where a "*" would be literal in a BRE: at the start of the pattern or
+    # of a group/alternative, or right after a leading "^"
+    atom_start = True
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= n:
+                raise Unsupported("trailing backslash")
+            nxt = pattern[i + 1]
+            i += 2
+            if not extended and nxt in "(){}|+?":
+                out.append(nxt)
+                atom_start = nxt in "(|"
+            elif nxt in _SAME_ESCAPES:
+                out.append(_SAME_ESCAPES[nxt])
+                atom_start = False
+            elif nxt.isalnum():
+                raise Unsupported(f"escape \\{nxt}")
+            else:
+                out.append(re.escape(nxt))
+                atom_start = False
+            continue
+        if c == "[":
+            end, body = _bracket(pattern, i)
+            out.append(body)
+            i = end
+            atom_start = False
+            continue
+        if c == "*" and atom_start and not extended:
+            out.append("\\*")
+        elif not extended and c in "(){}|+?":
+            out.append("\\" + c)
+        elif extended and c == "{" and not re.match(r"\{(\d+(,\d*)?|,\d+)\}", pattern[i:]):
+            out.append("\\{")
+        elif c == "^":
+            out.append(c)
+            atom_start = True
+            i += 1
+            continue
+        else:
+            out.append(c)
+        atom_start = extended and c in "(|"
+        i += 1
+    return "".join(out)
+
+
+def _bracket(pattern: str, start: int) -> tuple[int, str]:
+    """Translate the bracket expression at ``start``; return (end, regex)."""
+    i = start + 1
+    out = ["["]
+    if i < len(pattern) and pattern[i] == "^":
+        out.append("^")
+        i += 1
+    first = True
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "]" and not first:
+            out.append("]")
+            return i + 1, "".join(out)
+        first = False
+        if pattern.startswith("[:", i):
+            end = pattern.find(":]", i + 2)
+            name = pattern[i + 2:end] if end > 0 else ""
+            if name not in _CLASSES:
+                raise Unsupported(f"class [:{name}:]")
+            out.append(_CLASSES[name])
+            i = end + 2
+            continue
+        if pattern.startswith("[.", i) or pattern.startswith("[=", i):
+            raise Unsupported("collating element")
+        out.append("\\" + c if c in "\\[]^" else c)
+        i += 1
+    raise Unsupported("unterminated bracket")
+
+
+@dataclass
+class GrepStage:
+    """One ``grep`` (or the leading ``cat``) in a pipeline."""
+    regex: re.Pattern | None  # None for cat
+    paths: list[str]  # files read; empty when filtering the previous stage
+    invert: bool = False
+    count: bool = False
+    quiet: bool = False
+    after: int = 0
+
+
+def _parse_grep(argv: list[str]) -> GrepStage:
+    extended = argv[0] == "egrep"
+    fixed = argv[0] == "fgrep"
+    flags = 0
+    word = line = invert = count = quiet = False
+    after = 0
+    patterns: list[str] = []
+    operands: list[str] = []
+    args = iter(argv[1:])
+    for arg in args:
+        if operands or arg == "--" or not arg.startswith("-") or arg == "-":
+            if arg != "--":
+                operands.append(arg)
+            operands.extend(args)
+            break
+        opts = arg[1:]
+        while opts:
+            o, opts = opts[0], opts[1:]
+            if o in ("A", "e"):
+                value = opts or next(args, None)
+                opts = ""
+                if value is None:
+                    raise Unsupported(f"-{o} without value")
+                if o == "A":
+                    if not value.isdigit():
+                        raise Unsupported("bad -A")
+                    after = int(value)
+                else:
+                    patterns.append(value)
+            elif o == "E":
+                extended = True
+            elif o == "F":
+                fixed = True
+            elif o == "G":
+                extended = False
+            elif o == "i":
+                flags |= re.IGNORECASE
+            elif o == "v":
+                invert = True
+            elif o == "c":
+                count = True
+            elif o == "q":
+                quiet = True
+            elif o == "w":
+                word = True
+            elif o == "x":
+                line = True
+            elif o == "s":
+                pass  # only affects stderr
+            else:
+                raise Unsupported(f"grep -{o}")
+    if not patterns:
+        if not operands:
+            raise Unsupported("no pattern")
+        patterns.append(operands.pop(0))
+    parts = []
+    for p in patterns:
+        for alt in p.split("\n"):
+            parts.append(re.escape(alt) if fixed else translate_pattern(alt, extended))
+    body = "|".join(f"(?:{p})" for p in parts)
+    if word:
+        body = f"(?<!\\w)(?:{body})(?!\\w)"
+    if line:
+        body = f"^(?:{body})$"
+    try:
+        regex = re.compile(body, flags)
+    except re.error as e:
+        raise Unsupported(str(e)) from None
+    if invert and after:
+        raise Unsupported("-v with -A")
+    return GrepStage(regex, operands, invert, count, quiet, after)
+
+
+def _expands(command: str) -> bool:
+    """True if ``$``, a backtick or a backslash appears outside single
+    quotes, where the shell would expand or escape it."""
+    quote = ""
+    for c in command:
+        if quote == "'":
+            if c == "'":
+                quote = ""
+        elif c in "$`\\":
+            return True
+        elif c in "'\"" and (not quote or c == quote):
+            quote = "" if quote else c
+    return False
+
+
+def _segments(command: str) -> list[list[str]] | None:
+    """Split a plain pipeline into the argv of each stage, or None if it
+    uses expansion or any shell operator other than ``|``."""
+    if _expands(command):
+        return None
+    lexer = shlex.shlex(_DEVNULL.sub("", command), posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+    segments: list[list[str]] = [[]]
+    for token in tokens:
+        if token == "|":
+            segments.append([])
+        elif token and set(token) <= set("&;<>|()"):
+            return None
+        else:
+            segments[-1].append(token)
+    return segments
+
+
+def parse_filters(command: str) -> list[GrepStage] | None:
+    """Parse a pipeline of grep filters reading stdin (the part after a
+    ``|``), or None if it can't be reproduced locally."""
+    segments = _segments(command)
+    if not segments:
+        return None
+    stages = []
+    try:
+        for argv in segments:
+            if not argv or argv[0] not in ("grep", "egrep", "fgrep"):
+                return None
+            stage = _parse_grep(argv)
+            if stage.paths:
+                return None
+            stages.append(stage)
+    except Unsupported:
+        return None
+    return stages
+
+
+def filter_output(stages: list[GrepStage], rc: int, stdout: str) -> tuple[int, str]:
+    """Pipe (rc, stdout) through grep filters; the last one sets rc."""
+    for stage in stages:
+        out, total = _grep_text(stage, _lines(stdout))
+        if stage.count:
+            out = [str(total)]
+        stdout = "".join(line + "\n" for line in out)
+        rc = 0 if total else 1
+    return rc, stdout
+
+
+def parse_command(command: str) -> list[GrepStage] | None:
+    """Parse a grep/cat pipeline the snapshot can reproduce, or None."""
+    segments = _segments(command)
+    if segments is None:
+        return None
+    stages: list[GrepStage] = []
+    try:
+        for i, argv in enumerate(segments):
+            if argv and argv[0] == "sudo" and i == 0:
+                argv = argv[1:]  # same content; unreadable files fall back
+            if not argv:
+                return None
+            if argv[0] == "cat" and i == 0:
+                stage = GrepStage(None, argv[1:])
+                if not stage.paths or any(p.startswith("-") for p in stage.paths):
+                    return None
+            elif argv[0] in ("grep", "egrep", "fgrep"):
+                stage = _parse_grep(argv)
+            else:
+                return None
+            if (i == 0) != bool(stage.paths):
+                return None
+            if any(not p.startswith("/") for p in stage.paths):
+                return None
+            stages.append(stage)
+    except Unsupported:
+        return None
+    return stages
+
+
+@dataclass
+class SnapFile:
+    """A remote file as of the last time it was stat'ed this pass."""
+    mtime: int | None = None
+    size: int | None = None
+    text: str | None = None  # None when missing or not a regular file
+    missing: bool = False
+    is_dir: bool = False
+    unusable: bool = False  # unreadable, binary or too big: run remotely
+    settled: bool = False  # mtime was _SETTLE s old when read: safe to reuse
+
+
+def _lines(text: str) -> list[str]:
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _grep_text(stage: GrepStage, lines: list[str]) -> tuple[list[str], int]:
+    """Output lines and match count for one input stream."""
+    matched = [bool(stage.regex.search(line)) != stage.invert for line in lines]
+    total = sum(matched)
+    if stage.count or stage.quiet:
+        return [], total
+    if not stage.after:
+        return [line for line, m in zip(lines, matched) if m], total
+    out: list[str] = []
+    last = -1  # index of the last line printed
+    remaining = 0
+    for i, (text, m) in enumerate(zip(lines, matched)):
+        if m:
+            if last >= 0 and i > last + 1:
+                out.append("--")
+            remaining = stage.after
+        elif remaining:
+            remaining -= 1
+        else:
+            continue
+        out.append(text)
+        last = i
+    return out, total
+
+
+def run_pipeline(
+    stages: list[GrepStage],
+    files: dict[str, list[str] | None],
+    snap: dict[str, SnapFile],
+) -> tuple[int, str]:
+    """Reproduce (rc, stdout) of a pipeline from snapshot files.
+
+    ``files`` maps each glob operand to what it expanded to (None if the
+    expansion failed). Raises Unsupported if some file has to be read
+    remotely.
+    """
+    first = stages[0]
+    paths: list[str] = []
+    for operand in first.paths:
+        expanded = files.get(operand, [operand])
+        if expanded is None:
+            raise Unsupported(operand)
+        paths.extend(expanded)
+    for p in paths:
+        entry = snap.get(p)
+        if entry is None or entry.unusable:
+            raise Unsupported(p)
+
+    if first.regex is None:
+        ok = all(snap[p].text is not None for p in paths)
+        stdout = "".join(snap[p].text or "" for p in paths)
+        rc = 0 if ok else 1
+    else:
+        error = False
+        out: list[str] = []
+        total = 0
+        multi = len(paths) > 1
+        if multi and first.after:
+            raise Unsupported("-A over several files")
+        for p in paths:
+            entry = snap[p]
+            if entry.text is None:
+                error = True
+                continue
+            lines, count = _grep_text(first, _lines(entry.text))
+            total += count
+            if first.count:
+                out.append(f"{p}:{count}" if multi else str(count))
+            else:
+                out.extend(f"{p}:{line}" for line in lines) if multi else out.extend(lines)
+            if first.quiet and count:
+                break  # grep -q stops at the first match, errors or not
+        stdout = "".join(line + "\n" for line in out)
+        rc = 0 if first.quiet and total else 2 if error else 0 if total else 1
+
+    return filter_output(stages[1:], rc, stdout)
+
+
+async def _remote_now(sftp: asyncssh.SFTPClient) -> float | None:
+    """The remote clock from /proc (boot time plus uptime), never ahead of
+    the true time; None where /proc can't be read."""
+    try:
+        async with sftp.open("/proc/stat", "rb") as f:
+            stat = await f.read(MAX_SNAPSHOT_BYTES)
+        async with sftp.open("/proc/uptime", "rb") as f:
+            uptime = await f.read(4096)
+        btime = next(
+            int(line.split()[1]) for line in stat.splitlines() if line.startswith(b"btime ")
+        )
+        return btime + float(uptime.split()[0])
+    except (asyncssh.SFTPError, StopIteration, IndexError, ValueError):
+        return None
+
+
+class FileSnapshot:
+    """Remote file contents, kept across passes, keyed by (node, path)."""
+
+    def __init__(self) -> None:
+        self._files: dict[str, dict[str, SnapFile]] = {}
+
+    async def refresh(
+        self, sftp: asyncssh.SFTPClient, node_key: str, operands: list[str]
+    ) -> tuple[dict[str, list[str] | None], dict[str, SnapFile]]:
+        """Expand globs and bring every named file up to date.
+
+        Files are re-read only if their mtime or size changed since the
+        previous pass, and their earlier read was settled (see ``_SETTLE``).
+        Returns (glob expansions, files by path).
+        """
+        cached = self._files.setdefault(node_key, {})
+        expansions: dict[str, list[str] | None] = {}
+        # Taken before any stat, so it errs towards treating reads as unsettled
+        now = await _remote_now(sftp)
+
+        async def expand(operand: str) -> None:
+            if not _GLOB.search(operand):
+                return
+            try:
+                expansions[operand] = sorted(await sftp.glob(operand))
+            except asyncssh.SFTPNoSuchFile:
+                expansions[operand] = [operand]  # the shell passes it on as is
+            except asyncssh.SFTPError:
+                expansions[operand] = None
+
+        await asyncio.gather(*(expand(o) for o in operands))
+        paths = sorted({p for o in operands for p in expansions.get(o, [o]) or ()})
+
+        async def fetch(path: str) -> None:
+            old = cached.get(path)
+            try:
+                attrs = await sftp.stat(path)
+            except asyncssh.SFTPNoSuchFile:
+                cached[path] = SnapFile(missing=True)
+                return
+            except asyncssh.SFTPError:
+                cached[path] = SnapFile(unusable=True)
+                return
+            mode = attrs.permissions or 0
+            if statmod.S_ISDIR(mode):
+                cached[path] = SnapFile(is_dir=True)
+                return
+            if not statmod.S_ISREG(mode) or (attrs.size or 0) > MAX_SNAPSHOT_BYTES:
+                cached[path] = SnapFile(unusable=True)
+                return
+            if (
+                old is not None and old.text is not None and old.settled
+                and old.mtime == attrs.mtime and old.size == attrs.size
+            ):
+                return
+            entry = SnapFile(
+                mtime=attrs.mtime, size=attrs.size,
+                settled=now is not None and (attrs.mtime or 0) <= now - _SETTLE,
+            )
+            try:
+                async with sftp.open(path, "rb") as f:
+                    data = await f.read(MAX_SNAPSHOT_BYTES + 1)
+            except asyncssh.SFTPError:
+                entry.unusable = True
+            else:
+                # grep reports "binary file matches" for these; leave them remote
+                if b"\0" in data or len(data) > MAX_SNAPSHOT_BYTES:
+                    entry.unusable = True
+                else:
+                    entry.text = data.decode(errors="replace")
+            cached[path] = entry
+
+        await asyncio.gather(*(fetch(p) for p in paths))
+        return expansions, cached
+
+    def clear(self) -> None:
+        self._files.clear()
@@ -3,11 +3,27 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import os
 import time
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Protocol, TypeVar
 
-import asyncssh
+from ..lazy import lazy_import
+from ..models import CheckTiming, HostDef
+
+# Loaded on the first connection
+asyncssh = lazy_import("asyncssh")
+
+_T = TypeVar("_T")
+
+
+class _Feedable(Protocol):
+    def feed(self, text: str) -> bool: ...
+
+
+_Sink = TypeVar("_Sink", bound=_Feedable)
 
 
 # Default Vagrant directory — override with EXAMINER_VAGRANT_DIR env var
@@ -18,13 +34,126 @@ _DEFAULT_VAGRANT_DIR = os.path.join(
 
 CONNECT_TIMEOUT = 10
 COMMAND_TIMEOUT = 30
-STALE_SECONDS = 300  # re-connect after 5 minutes idle
+
+# Once a host has connected, its connect timeout shrinks to a multiple of
+# its smoothed handshake time (never below MIN_CONNECT_TIMEOUT), and command
+# timeouts stretch for hosts whose commands run slowly.
+MIN_CONNECT_TIMEOUT = 2
+CONNECT_TIMEOUT_FACTOR = 4
+COMMAND_TIMEOUT_FACTOR = 4
+
+# After a failed connect a host is skipped (its checks fail at once) while a
+# background probe retries, waiting PROBE_INITIAL_DELAY seconds at first and
+# doubling up to PROBE_MAX_DELAY.
+PROBE_INITIAL_DELAY = 1.0
+PROBE_MAX_DELAY = 30.0
+
+# SSH-level keepalives detect a dead VM without extra execs: after
+# KEEPALIVE_INTERVAL * KEEPALIVE_COUNT_MAX seconds of silence the
+# connection is closed and dropped from the pool.
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_COUNT_MAX = 3
+
+# Upper bound on open connections (one socket each) across every host and
+# lab environment; idle ones are closed least-recently-used first. Override
+# with EXAMINER_MAX_CONNECTIONS.
+MAX_CONNECTIONS = 256
+
+# Characters read from a streamed command's stdout at a time
+STREAM_CHUNK = 64 * 1024
+
+
+def _connection_errors() -> tuple[type[BaseException], ...]:
+    """Failures worth one retry. A channel-open refusal alone doesn't mean
+    the connection is dead (the connection-lost callback covers that case)."""
+    return (asyncssh.DisconnectError, asyncssh.ChannelOpenError, OSError)
 
 
 def _vagrant_dir() -> Path:
     return Path(os.environ.get("EXAMINER_VAGRANT_DIR", _DEFAULT_VAGRANT_DIR))
 
 
+def _default_port() -> int:
+    try:
+        return int(os.environ.get("EXAMINER_SSH_PORT", "22"))
+    except ValueError:
+        return 22
+
+
+def _default_max_connections() -> int:
+    try:
+        return max(1, int(os.environ["EXAMINER_MAX_CONNECTIONS"]))
+    except (KeyError, ValueError):
+        pass
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError):
+        return MAX_CONNECTIONS
+    # Leave half the descriptor budget for everything else
+    return max(1, min(MAX_CONNECTIONS, soft // 2)) if soft > 0 else MAX_CONNECTIONS
+
+
+def _pool_key(host: str, ip: str, user: str) -> str:
+    """Connections are keyed by address as well as node name, so identical
+    node names in different lab environments never share a connection."""
+    return f"{host}|{user}@{ip}"
+
+
+class HostUnavailable(Exception):
+    """A host's circuit breaker is open: it failed to connect recently."""
+
+
+class _Latency:
+    """Smoothed handshake and command times for one host (RFC 6298 style)."""
+
+    def __init__(self) -> None:
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.exec_avg: float | None = None
+
+    def add_connect(self, seconds: float) -> None:
+        if self.srtt is None:
+            self.srtt, self.rttvar = seconds, seconds / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+            self.srtt = 0.875 * self.srtt + 0.125 * seconds
+
+    def add_exec(self, seconds: float) -> None:
+        self.exec_avg = seconds if self.exec_avg is None else 0.875 * self.exec_avg + 0.125 * seconds
+
+    def connect_timeout(self) -> float:
+        if self.srtt is None:
+            return CONNECT_TIMEOUT
+        adaptive = CONNECT_TIMEOUT_FACTOR * (self.srtt + 4 * self.rttvar)
+        return min(CONNECT_TIMEOUT, max(MIN_CONNECT_TIMEOUT, adaptive))
+
+    def command_timeout(self, timeout: float) -> float:
+        if self.exec_avg is None:
+            return timeout
+        return min(timeout * COMMAND_TIMEOUT_FACTOR, max(timeout, COMMAND_TIMEOUT_FACTOR * self.exec_avg))
+
+
+class _Breaker:
+    """Open circuit for one host, with the probe that will close it."""
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+        self.delay = PROBE_INITIAL_DELAY
+        self.retry_at = time.monotonic() + self.delay
+        self.probe: asyncio.Task | None = None
+
+    def describe(self, host: str) -> str:
+        wait = max(0.0, self.retry_at - time.monotonic())
+        return f"{host} unreachable ({self.error}); retrying in {wait:.0f}s"
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return "connection timed out"
+    return str(exc) or type(exc).__name__
+
+
 def _find_vagrant_key(node_name: str) -> str | None:
     """Try to find the Vagrant-generated private key for a VM."""
     for provider in ("vmware_desktop", "virtualbox", "libvirt"):
@@ -34,104 +163,528 @@ def _find_vagrant_key(node_name: str) -> str | None:
     return None
 
 
+@functools.cache
+def _pool_client() -> type:
+    """The pool's SSHClient class, defined once asyncssh is loaded."""
+
+    class _PoolClient(asyncssh.SSHClient):
+        """Tells the pool when a connection drops so it's never handed out again."""
+
+        def __init__(self, pool: SSHConnectionPool, key: str) -> None:
+            self._pool = pool
+            self._key = key
+            self._conn: asyncssh.SSHClientConnection | None = None
+
+        def connection_made(self, conn: asyncssh.SSHClientConnection) -> None:
+            self._conn = conn
+
+        def connection_lost(self, exc: Exception | None) -> None:
+            if self._conn is not None:
+                self._pool._discard(self._key, self._conn)
+
+    return _PoolClient
+
+
 class SSHConnectionPool:
-    """Manages persistent AsyncSSH connections to Vagrant VMs."""
+    """Manages persistent AsyncSSH connections to Vagrant VMs.
 
-    def __init__(self) -> None:
+    Health is tracked passively — keepalives and connection-lost callbacks
+    evict dead connections — so a cached connection is returned without a
+    probe. Each host has its own lock; connecting to one never blocks
+    another. At most ``max_connections`` are open at once. A host that
+    fails to connect is skipped until a background probe reaches it again,
+    and timeouts follow each host's observed latency. Hosts with a ``jump``
+    host (see ``add_routes``) are reached through its pooled connection.
+    """
+
+    def __init__(self, max_connections: int | None = None, port: int | None = None) -> None:
+        self.max_connections = max_connections or _default_max_connections()
+        self.port = port or _default_port()
+        # Ordered least- to most-recently used
         self._connections: dict[str, asyncssh.SSHClientConnection] = {}
-        self._timestamps: dict[str, float] = {}
-        self._lock = asyncio.Lock()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._in_use: dict[str, int] = {}
+        self._opening = 0
+        self._slot_freed = asyncio.Event()
+        # Seconds taken by each new connection, per host
+        self.connect_times: dict[str, list[float]] = {}
+        self._latency: dict[str, _Latency] = {}
+        self._breakers: dict[str, _Breaker] = {}
+        # Parsed Vagrant key per node name (None: no key on disk), and the
+        # auth method that last worked per host
+        self._keys: dict[str, asyncssh.SSHKey | None] = {}
+        self._auth: dict[str, str] = {}
+        # Jump host (name, ip, user) per host reached through one
+        self._routes: dict[str, tuple[str, str, str]] = {}
 
-    async def _connect(self, host: str, ip: str, user: str = "vagrant") -> asyncssh.SSHClientConnection:
-        """Open a new SSH connection, trying Vagrant key then password."""
-        key_path = _find_vagrant_key(host)
-        known_hosts = None  # Vagrant VMs have ephemeral host keys
+    def _host_lock(self, host: str) -> asyncio.Lock:
+        lock = self._locks.get(host)
+        if lock is None:
+            lock = self._locks[host] = asyncio.Lock()
+        return lock
 
-        try:
+    def _vagrant_key(self, host: str) -> asyncssh.SSHKey | None:
+        """The host's Vagrant private key, found and parsed once per pool."""
+        if host not in self._keys:
+            key_path = _find_vagrant_key(host)
+            key = None
             if key_path:
-                conn = await asyncio.wait_for(
-                    asyncssh.connect(
-                        ip,
-                        username=user,
-                        client_keys=[key_path],
-                        known_hosts=known_hosts,
-                    ),
-                    timeout=CONNECT_TIMEOUT,
+                try:
+                    key = asyncssh.read_private_key(key_path)
+                except (OSError, asyncssh.KeyImportError):
+                    pass  # unreadable or passphrase-protected; use the password
+            self._keys[host] = key
+        return self._keys[host]
+
+    def add_routes(self, hosts: Mapping[str, HostDef]) -> None:
+        """Tunnel connections to hosts that declare a ``jump`` host through
+        that host's connection instead of opening their own socket."""
+        for name, host in hosts.items():
+            jump = hosts.get(host.jump) if host.jump else None
+            if jump is not None:
+                self._routes[_pool_key(name, host.ip, host.ssh_user)] = (
+                    jump.name, jump.ip, jump.ssh_user
                 )
-                return conn
-        except Exception:
-            pass
 
-        # Fallback to password auth
-        conn = await asyncio.wait_for(
-            asyncssh.connect(
-                ip,
-                username=user,
-                password="vagrant",
-                known_hosts=known_hosts,
-            ),
-            timeout=CONNECT_TIMEOUT,
+    @contextlib.asynccontextmanager
+    async def _tunnel(self, key: str) -> AsyncIterator[asyncssh.SSHClientConnection | None]:
+        """Yield the jump host connection to open ``key``'s connection
+        through (None for a direct connection), kept from capacity eviction
+        until the new connection is pooled."""
+        route = self._routes.get(key)
+        if route is None:
+            yield None
+            return
+        conn = await self.get(*route)
+        jump_key = _pool_key(*route)
+        self._pin(jump_key)
+        try:
+            yield conn
+        finally:
+            self._unpin(jump_key)
+
+    def forget_credentials(self, host: str, ip: str, user: str = "vagrant") -> None:
+        """Look for the host's key again and retry every auth method next time."""
+        self._keys.pop(host, None)
+        self._auth.pop(_pool_key(host, ip, user), None)
+
+    async def _connect(
+        self,
+        host: str,
+        ip: str,
+        user: str = "vagrant",
+        timeout: float = CONNECT_TIMEOUT,
+        tunnel: asyncssh.SSHClientConnection | None = None,
+    ) -> asyncssh.SSHClientConnection:
+        """Open a new SSH connection with the Vagrant key or the password,
+        directly or through the ``tunnel`` connection.
+
+        Whichever method last worked for the host is tried first. All
+        attempts share one ``timeout``; a timeout or network error means the
+        host is unreachable, so the next method is only tried when one is
+        refused.
+        """
+        deadline = time.monotonic() + timeout
+        pool_key = _pool_key(host, ip, user)
+        options = dict(
+            port=self.port,
+            known_hosts=None,  # Vagrant VMs have ephemeral host keys
+            client_factory=lambda: _pool_client()(self, pool_key),
+            keepalive_interval=KEEPALIVE_INTERVAL,
+            keepalive_count_max=KEEPALIVE_COUNT_MAX,
         )
-        return conn
+        if tunnel is not None:
+            options["tunnel"] = tunnel
+        methods = ["key", "password"]
+        if self._auth.get(pool_key) == "password":
+            methods.reverse()
+
+        error: Exception | None = None
+        for method in methods:
+            if method == "key":
+                key = self._vagrant_key(host)
+                if key is None:
+                    continue
+                credentials: dict = dict(client_keys=[key])
+            else:
+                credentials = dict(password="vagrant")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                conn = await asyncio.wait_for(
+                    asyncssh.connect(ip, username=user, **credentials, **options),
+                    timeout=remaining,
+                )
+            except (asyncio.TimeoutError, OSError):
+                raise
+            except Exception as e:
+                if method == "key":
+                    self._keys.pop(host, None)  # re-read it next time, in case it changed
+                error = e
+                continue
+            self._auth[pool_key] = method
+            return conn
+        assert error is not None  # password is always tried
+        raise error
+
+    def _host_latency(self, key: str) -> _Latency:
+        latency = self._latency.get(key)
+        if latency is None:
+            latency = self._latency[key] = _Latency()
+        return latency
+
+    def _check_breaker(self, host: str, key: str) -> None:
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            raise HostUnavailable(breaker.describe(host))
+
+    def _trip(self, host: str, ip: str, user: str, key: str, exc: BaseException) -> None:
+        """Open the host's breaker and start probing it in the background."""
+        if key in self._breakers:
+            return
+        breaker = self._breakers[key] = _Breaker(_describe(exc))
+        breaker.probe = asyncio.ensure_future(self._probe(host, ip, user, key, breaker))
+
+    async def _probe(self, host: str, ip: str, user: str, key: str, breaker: _Breaker) -> None:
+        """Retry connecting with exponential backoff until the host answers,
+        then close the breaker and keep the connection."""
+        while True:
+            await asyncio.sleep(max(0.0, breaker.retry_at - time.monotonic()))
+            start = time.perf_counter()
+            try:
+                async with self._tunnel(key) as tunnel:
+                    conn = await self._connect(host, ip, user, tunnel=tunnel)
+            except Exception as e:
+                breaker.error = _describe(e)
+                breaker.delay = min(breaker.delay * 2, PROBE_MAX_DELAY)
+                breaker.retry_at = time.monotonic() + breaker.delay
+                continue
+            self._host_latency(key).add_connect(time.perf_counter() - start)
+            if self._breakers.get(key) is breaker:
+                del self._breakers[key]
+            if key not in self._connections and len(self._connections) + self._opening < self.max_connections:
+                self._connections[key] = conn
+                self._slot_freed.set()
+            else:
+                conn.close()
+            return
+
+    def reset_breaker(self, host: str, ip: str, user: str = "vagrant") -> None:
+        """Forget a host's recent failure so the next request tries it again."""
+        breaker = self._breakers.pop(_pool_key(host, ip, user), None)
+        if breaker is not None and breaker.probe is not None:
+            breaker.probe.cancel()
 
     async def get(self, host: str, ip: str, user: str = "vagrant") -> asyncssh.SSHClientConnection:
-        """Get or create a connection. Re-connects if stale."""
-        async with self._lock:
-            conn = self._connections.get(host)
-            ts = self._timestamps.get(host, 0)
+        """Get the cached connection for a host, connecting if there is none.
 
-            if conn is not None and (time.time() - ts) < STALE_SECONDS:
-                try:
-                    # Quick liveness check
-                    await asyncio.wait_for(conn.run("true", check=True), timeout=5)
-                    self._timestamps[host] = time.time()
-                    return conn
-                except Exception:
+        Raises HostUnavailable straight away while the host's breaker is
+        open (it failed to connect and hasn't answered a probe since). A
+        host behind an unavailable jump host fails the same way.
+        """
+        key = _pool_key(host, ip, user)
+        conn = self._connections.get(key)
+        if conn is not None:
+            self._connections[key] = self._connections.pop(key)  # mark used
+            return conn
+        self._check_breaker(host, key)
+        async with self._host_lock(key):
+            # Another caller may have connected — or failed — while we waited
+            conn = self._connections.get(key)
+            if conn is None:
+                self._check_breaker(host, key)
+                latency = self._host_latency(key)
+                # The jump connection comes first: it may need a slot itself
+                async with self._tunnel(key) as tunnel:
+                    await self._reserve_slot()
+                    start = time.perf_counter()
                     try:
-                        conn.close()
-                    except Exception:
-                        pass
-
-            # New connection needed
-            conn = await self._connect(host, ip, user)
-            self._connections[host] = conn
-            self._timestamps[host] = time.time()
+                        conn = await self._connect(
+                            host, ip, user, latency.connect_timeout(), tunnel
+                        )
+                    except Exception as e:
+                        self._trip(host, ip, user, key, e)
+                        raise
+                    finally:
+                        self._opening -= 1
+                        self._slot_freed.set()
+                    self._connections[key] = conn
+                elapsed = time.perf_counter() - start
+                latency.add_connect(elapsed)
+                self.connect_times.setdefault(host, []).append(elapsed)
             return conn
 
+    async def _reserve_slot(self) -> None:
+        """Wait until a new connection fits under ``max_connections``,
+        closing idle connections (least recently used first) to make room.
+        A connection other pooled connections are tunnelled through is never
+        idle."""
+        while len(self._connections) + self._opening >= self.max_connections:
+            carrying = {
+                _pool_key(*self._routes[k]) for k in self._connections if k in self._routes
+            }
+            idle = next(
+                (
+                    k for k in self._connections
+                    if not self._in_use.get(k) and k not in carrying
+                ),
+                None,
+            )
+            if idle is not None:
+                self._discard(idle)
+                continue
+            self._slot_freed.clear()
+            await self._slot_freed.wait()
+        self._opening += 1
+
+    def _discard(self, key: str, conn: asyncssh.SSHClientConnection | None = None) -> None:
+        """Drop a pooled connection (only if it is still ``conn``, when given)."""
+        current = self._connections.get(key)
+        if current is None or (conn is not None and current is not conn):
+            return
+        del self._connections[key]
+        self._slot_freed.set()
+        try:
+            current.close()
+        except Exception:
+            pass
+
+    def invalidate(self, host: str, ip: str, user: str = "vagrant") -> None:
+        """Close and forget the connection to a host, if any."""
+        self._discard(_pool_key(host, ip, user))
+
+    def _pin(self, key: str) -> None:
+        """Mark the connection busy so capacity eviction leaves it alone."""
+        self._in_use[key] = self._in_use.get(key, 0) + 1
+
+    def _unpin(self, key: str) -> None:
+        self._in_use[key] -= 1
+        if not self._in_use[key]:
+            del self._in_use[key]
+            self._slot_freed.set()
+
+    async def _with_connection(
+        self,
+        host: str,
+        ip: str,
+        user: str,
+        operation: Callable[[asyncssh.SSHClientConnection], Awaitable[_T]],
+        timeout: float,
+        timing: CheckTiming | None = None,
+        commands: int = 1,
+    ) -> _T:
+        """Await ``operation(conn)`` on the host's connection, reconnecting
+        and retrying once if the cached connection turns out to be dead.
+        Fills in ``timing`` if given. ``timeout`` is stretched for hosts
+        whose commands have been running slowly.
+
+        For a script running ``commands`` commands back to back, ``timeout``
+        is per command and the elapsed time feeds the host's exec average
+        per command, so one big batch doesn't stretch later single execs.
+        """
+        timing = timing if timing is not None else CheckTiming()
+        key = _pool_key(host, ip, user)
+        latency = self._host_latency(key)
+        for attempt in range(2):
+            start = time.perf_counter()
+            timing.reused = timing.reused and key in self._connections
+            conn = await self.get(host, ip, user)
+            started = time.perf_counter()
+            timing.connect += started - start
+            self._pin(key)
+            try:
+                result = await asyncio.wait_for(
+                    operation(conn), timeout=latency.command_timeout(timeout) * commands
+                )
+                elapsed = time.perf_counter() - started
+                latency.add_exec(elapsed / commands)
+                timing.exec += elapsed
+                return result
+            except asyncio.TimeoutError:
+                # A slow command, not a dead connection (TimeoutError is an
+                # OSError since 3.11): keep the connection and its other
+                # channels, and don't run the command again
+                timing.exec += time.perf_counter() - started
+                raise
+            except _connection_errors() as e:
+                timing.exec += time.perf_counter() - started
+                if attempt:
+                    raise
+                if not isinstance(e, asyncssh.ChannelOpenError):
+                    self._discard(key, conn)
+            finally:
+                self._unpin(key)
+        raise AssertionError("unreachable")
+
+    async def _run(
+        self,
+        host: str,
+        ip: str,
+        command: str,
+        user: str,
+        timeout: float,
+        encoding: str | None,
+        timing: CheckTiming | None = None,
+        commands: int = 1,
+    ) -> tuple[int, str | bytes]:
+        result = await self._with_connection(
+            host, ip, user,
+            lambda conn: conn.run(command, check=False, encoding=encoding),
+            timeout, timing, commands,
+        )
+        rc = result.exit_status if result.exit_status is not None else -1
+        return rc, result.stdout
+
     async def run_command(
-        self, host: str, ip: str, command: str, user: str = "vagrant"
+        self,
+        host: str,
+        ip: str,
+        command: str,
+        user: str = "vagrant",
+        timeout: float = COMMAND_TIMEOUT,
+        timing: CheckTiming | None = None,
+        commands: int = 1,
     ) -> tuple[int, str]:
-        """Run a command on a host, return (exit_code, stdout)."""
-        conn = await self.get(host, ip, user)
-        result = await asyncio.wait_for(
-            conn.run(command, check=False),
-            timeout=COMMAND_TIMEOUT,
+        """Run a command on a host, return (exit_code, stdout).
+
+        ``commands``: how many commands ``command`` runs back to back
+        (see ``_with_connection``).
+        """
+        rc, stdout = await self._run(
+            host, ip, command, user, timeout, "utf-8", timing, commands
         )
-        rc = result.exit_status if result.exit_status is not None else -1
-        stdout = result.stdout or ""
-        return rc, stdout
+        return rc, stdout or ""
+
+    async def stream_command(
+        self,
+        host: str,
+        ip: str,
+        command: str,
+        new_sink: Callable[[], _Sink],
+        user: str = "vagrant",
+        timeout: float = COMMAND_TIMEOUT,
+        timing: CheckTiming | None = None,
+        commands: int = 1,
+    ) -> tuple[int | None, _Sink]:
+        """Run a command, feeding its stdout to a sink chunk by chunk as it
+        arrives instead of buffering it. Returns (exit_code, sink).
+
+        ``new_sink()`` is called for each attempt, so a retry after a
+        dropped connection starts from an empty sink. When ``sink.feed``
+        returns True the command is killed and the exit code is None.
+        ``commands`` is as for ``run_command``.
+        """
+
+        async def stream(conn: asyncssh.SSHClientConnection) -> tuple[int | None, _Sink]:
+            sink = new_sink()
+            async with conn.create_process(
+                command, stdin=asyncssh.DEVNULL, stderr=asyncssh.DEVNULL
+            ) as process:
+                while chunk := await process.stdout.read(STREAM_CHUNK):
+                    if sink.feed(chunk):
+                        try:
+                            process.send_signal("KILL")
+                        except (asyncssh.Error, OSError):
+                            pass
+                        # Closing the channel also breaks the command's stdout
+                        return None, sink
+                await process.wait()
+                rc = process.exit_status
+                return (rc if rc is not None else -1), sink
+
+        return await self._with_connection(
+            host, ip, user, stream, timeout, timing, commands
+        )
+
+    async def run_binary(
+        self,
+        host: str,
+        ip: str,
+        command: str,
+        user: str = "vagrant",
+        timeout: float = COMMAND_TIMEOUT,
+    ) -> tuple[int, bytes]:
+        """Run a command on a host, return (exit_code, raw stdout bytes)."""
+        rc, stdout = await self._run(host, ip, command, user, timeout, None)
+        return rc, stdout or b""
+
+    async def run_sftp(
+        self,
+        host: str,
+        ip: str,
+        operation: Callable[[asyncssh.SFTPClient], Awaitable[_T]],
+        user: str = "vagrant",
+        timeout: float = COMMAND_TIMEOUT,
+        timing: CheckTiming | None = None,
+    ) -> _T:
+        """Open one SFTP session on the host's connection and await
+        ``operation(sftp)`` in it."""
+
+        async def session(conn: asyncssh.SSHClientConnection) -> _T:
+            async with conn.start_sftp_client() as sftp:
+                return await operation(sftp)
+
+        return await self._with_connection(host, ip, user, session, timeout, timing)
+
+    @contextlib.asynccontextmanager
+    async def open_process(
+        self, host: str, ip: str, command: str, user: str = "vagrant"
+    ) -> AsyncIterator[asyncssh.SSHClientProcess]:
+        """Start a long-running command on the host's connection and yield
+        its process; the channel is closed on exit. No timeout applies."""
+        key = _pool_key(host, ip, user)
+        conn = await self.get(host, ip, user)
+        self._pin(key)
+        try:
+            async with conn.create_process(command, stderr=asyncssh.DEVNULL) as process:
+                yield process
+        finally:
+            self._unpin(key)
 
     async def test_connectivity(self, host: str, ip: str, user: str = "vagrant") -> tuple[bool, str]:
-        """Test if we can connect and run a command. Returns (ok, message)."""
+        """Test if we can connect and run a command. Returns (ok, message).
+
+        Always makes a real attempt, even if the host failed recently, and
+        looks for the Vagrant key afresh.
+        """
+        self.reset_breaker(host, ip, user)
+        self.forget_credentials(host, ip, user)
         try:
-            conn = await self.get(host, ip, user)
-            result = await asyncio.wait_for(
-                conn.run("hostname", check=False),
-                timeout=COMMAND_TIMEOUT,
-            )
-            return True, f"Connected — hostname: {(result.stdout or '').strip()}"
+            _, stdout = await self.run_command(host, ip, "hostname", user)
+            return True, f"Connected — hostname: {stdout.strip()}"
         except asyncio.TimeoutError:
             return False, "Connection timed out"
         except Exception as e:
             return False, f"Connection failed: {e}"
 
+    async def warm_up(
+        self, hosts: Mapping[str, HostDef]
+    ) -> AsyncIterator[tuple[str, bool, str]]:
+        """Connect to every host concurrently, yielding (name, ok, message)
+        as each finishes. Successful connections stay cached in the pool."""
+
+        self.add_routes(hosts)
+
+        async def probe(name: str, host: HostDef) -> tuple[str, bool, str]:
+            ok, msg = await self.test_connectivity(name, host.ip, host.ssh_user)
+            return name, ok, msg
+
+        for fut in asyncio.as_completed(
+            [probe(name, host) for name, host in hosts.items()]
+        ):
+            yield await fut
+
     async def close_all(self) -> None:
-        """Close all connections."""
-        async with self._lock:
-            for conn in self._connections.values():
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            self._connections.clear()
-            self._timestamps.clear()
+        """Close all connections and stop probing unreachable hosts."""
+        for breaker in self._breakers.values():
+            if breaker.probe is not None:
+                breaker.probe.cancel()
+        self._breakers.clear()
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
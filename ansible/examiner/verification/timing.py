@@ -0,0 +1,87 @@
+"""Timing summaries — per-node latency percentiles and JSON traces."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+from ..models import Check, CheckResult, Exam
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _timed(exam: Exam) -> list[tuple[Check, CheckResult]]:
+    return [
+        (check, result)
+        for task in exam.tasks
+        for check, result in zip(task.checks, task.results)
+        if result.timing is not None
+    ]
+
+
+def node_summary(exam: Exam) -> dict[str, dict[str, float]]:
+    """Per-node check count and p50/p95 of total and exec time.
+
+    Cache hits are left out so they don't mask a slow VM.
+    """
+    totals: dict[str, list[float]] = {}
+    execs: dict[str, list[float]] = {}
+    for check, result in _timed(exam):
+        if result.timing.source == "cache":
+            continue
+        totals.setdefault(check.node, []).append(result.timing.total)
+        execs.setdefault(check.node, []).append(result.timing.exec)
+    return {
+        node: {
+            "checks": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "exec_p50": percentile(execs[node], 50),
+            "exec_p95": percentile(execs[node], 95),
+        }
+        for node, values in sorted(totals.items())
+    }
+
+
+def slowest_checks(exam: Exam, limit: int = 5) -> list[tuple[Check, CheckResult]]:
+    """The checks with the longest total time, slowest first."""
+    timed = [item for item in _timed(exam) if item[1].timing.source != "cache"]
+    timed.sort(key=lambda item: item[1].timing.total, reverse=True)
+    return timed[:limit]
+
+
+def write_trace(
+    exam: Exam,
+    path: str | Path,
+    connect_times: dict[str, list[float]] | None = None,
+) -> Path:
+    """Write every check's timing (plus per-host connect times) as JSON."""
+    path = Path(path)
+    checks = [
+        {
+            "check_id": check.id,
+            "node": check.node,
+            "status": result.status.value,
+            "connect": result.timing.connect,
+            "reused": result.timing.reused,
+            "exec": result.timing.exec,
+            "total": result.timing.total,
+            "source": result.timing.source,
+        }
+        for check, result in _timed(exam)
+    ]
+    path.write_text(json.dumps({
+        "exam_id": exam.id,
+        "checks": checks,
+        "nodes": node_summary(exam),
+        "connect_times": connect_times or {},
+    }, indent=2))
+    return path
@@ -0,0 +1,283 @@
+"""Watch mode — re-verify checks as the files they depend on change.
+
+Each check is mapped to the remote paths it depends on: absolute paths in
+its command, the path of a typed check, the exam's working_dir for Ansible
+tooling, and well-known state files for commands like ``rpm`` or
+``systemctl`` (see ``_IMPLICIT_PATHS``). One change feed per node reports
+changes to those paths — ``inotifywait`` over a channel on the pooled
+connection, or a stat sweep every ``POLL_INTERVAL`` seconds where
+inotify-tools isn't installed — and the checks affected by a burst of
+changes are re-verified together once it settles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import posixpath
+import re
+import shlex
+import time
+from typing import Iterable
+
+from ..models import Check, Exam, Task
+from .cache import parse_stat_output
+from .heavy import HEAVY_TOOLS, command_names
+from .runner import ResultCallback, VerificationRunner
+
+# Quiet time after the last change before re-verifying, and the longest a
+# steady stream of changes can hold re-verification back
+DEBOUNCE = 0.5
+MAX_DEBOUNCE = 3.0
+
+# Minimum gap between the starts of two watch-triggered passes
+MIN_INTERVAL = 2.0
+
+# Stat sweep period on nodes without inotifywait
+POLL_INTERVAL = 5.0
+
+# Wait before restarting a feed that failed (node down, channel closed)
+RETRY_DELAY = 5.0
+
+# A feed dying sooner than this after starting is treated as inotify not
+# working on that node (e.g. out of watches), so it falls back to polling
+_FEED_MIN_LIFETIME = 5.0
+
+# Directory targets are watched this many levels deep
+_WATCH_DEPTH = 3
+
+# State files behind commands that don't name what they read
+_RPMDB = ("/var/lib/rpm",)
+_ACCOUNTS = ("/etc/passwd", "/etc/group")
+_SYSTEMD = ("/etc/systemd/system", "/run/systemd/units")
+_SELINUX = ("/etc/selinux",)
+_LVM = ("/etc/lvm",)
+_MOUNTS = ("/etc/fstab",)
+_IMPLICIT_PATHS: dict[str, tuple[str, ...]] = {
+    "rpm": _RPMDB, "yum": _RPMDB, "dnf": _RPMDB,
+    "id": _ACCOUNTS, "getent": _ACCOUNTS, "groups": _ACCOUNTS,
+    "systemctl": _SYSTEMD,
+    "firewall-cmd": ("/etc/firewalld",),
+    "getenforce": _SELINUX, "getsebool": _SELINUX, "semanage": _SELINUX,
+    "crontab": ("/var/spool/cron",),
+    "vgs": _LVM, "lvs": _LVM, "pvs": _LVM,
+    "findmnt": _MOUNTS, "mount": _MOUNTS, "df": _MOUNTS,
+    "hostname": ("/etc/hostname",), "hostnamectl": ("/etc/hostname",),
+}
+_TYPED_PATHS: dict[str, tuple[str, ...]] = {
+    "rpm_installed": _RPMDB,
+    "user_in_group": _ACCOUNTS,
+    "service_state": _SYSTEMD,
+}
+
+# Absolute (or ~/) paths in a command, up to a glob character
+_PATH = re.compile(r"""(?:^|(?<=[\s'"=:(<>]))(~?/(?!/)[^\s'"|;&<>()$`*?\[]*)""")
+# Changes never worth re-verifying for: Ansible's own temp files and
+# editor swap/backup files
+_IGNORED = r"(^|/)\.ansible(/|$)|\.retry$|/__pycache__(/|$)|\.sw[a-px]$|~$|/4913$"
+_IGNORED_RE = re.compile(_IGNORED)
+
+_EVENTS = "modify,attrib,close_write,move,create,delete"
+
+
+def check_paths(check: Check, working_dir: str, home: str) -> set[str]:
+    """Remote paths whose changes can change ``check``'s outcome."""
+    if check.type != "command":
+        if "path" in check.params:
+            return {check.params["path"]}
+        return set(_TYPED_PATHS.get(check.type, ()))
+    paths: set[str] = set()
+    for match in _PATH.finditer(check.command):
+        path = match.group(1)
+        if path.startswith("~"):
+            path = home + path[1:]
+        path = posixpath.normpath(path)
+        if path != "/" and not path.startswith(("/dev/", "/proc/", "/sys/")):
+            paths.add(path)
+    for name in command_names(check.command):
+        paths.update(_IMPLICIT_PATHS.get(name, ()))
+        if name in HEAVY_TOOLS:
+            paths.add(working_dir)
+    return paths
+
+
+def affects(changed: str, path: str) -> bool:
+    """True if a change at ``changed`` can affect ``path``: the same path,
+    something inside it, or a directory on the way to it."""
+    return (
+        changed == path
+        or changed.startswith(path + "/")
+        or path.startswith(changed + "/")
+    )
+
+
+def feed_script(paths: list[str]) -> str:
+    """Script streaming ``EVENTS|path`` lines for changes under ``paths``.
+
+    Directories are watched ``_WATCH_DEPTH`` levels deep; for a file (or a
+    path that doesn't exist yet) its nearest existing parent directory is
+    watched. Runs through passwordless sudo when available. The watcher is
+    killed when the channel closes.
+    """
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    return (
+        "S=; sudo -n true 2>/dev/null && S='sudo -n'\n"
+        "l=$(mktemp) || exit 1\n"
+        f"for p in {quoted}; do\n"
+        f"  if [ -d \"$p\" ]; then $S find \"$p\" -maxdepth {_WATCH_DEPTH} -type d "
+        "-not -path '*/.ansible*' 2>/dev/null\n"
+        "  else d=$(dirname -- \"$p\"); while [ ! -d \"$d\" ]; do d=$(dirname -- \"$d\"); done; "
+        "echo \"$d\"; fi\n"
+        "done | sort -u | while IFS= read -r d; do "
+        "{ [ -n \"$S\" ] || [ -r \"$d\" ]; } && printf '%s\\n' \"$d\"; done > \"$l\"\n"
+        f"$S inotifywait -m -q -e {_EVENTS} --format '%e|%w%f' "
+        f"--exclude {shlex.quote(_IGNORED)} --fromfile \"$l\" & w=$!\n"
+        # Background jobs get /dev/null as stdin unless redirected explicitly
+        "exec 3<&0; { read -r _ <&3; kill $w; } >/dev/null 2>&1 &\n"
+        "wait $w; rc=$?; rm -f \"$l\"; exit $rc\n"
+    )
+
+
+def poll_script(paths: list[str]) -> str:
+    """Script printing ``path<TAB>digest`` per path; the digest changes when
+    the path or anything ``_WATCH_DEPTH`` levels inside it changes."""
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    return (
+        "S=; sudo -n true 2>/dev/null && S='sudo -n'\n"
+        f"for p in {quoted}; do printf '%s\\t%s\\n' \"$p\" \"$("
+        "{ $S stat -c '%F|%s|%i|%y|%z' -- \"$p\"; "
+        f"[ -d \"$p\" ] && $S find \"$p\" -maxdepth {_WATCH_DEPTH} -printf '%T@ %s %p\\n' | sort; "
+        "} 2>/dev/null | md5sum)\"; done\n"
+    )
+
+
+class ExamWatcher:
+    """Follows change feeds on every node and re-verifies affected checks
+    through the runner until cancelled."""
+
+    def __init__(
+        self, runner: VerificationRunner, on_result: ResultCallback | None = None
+    ) -> None:
+        self.runner = runner
+        self.on_result = on_result
+        exam: Exam = runner.exam
+        # node -> watched path -> checks depending on it
+        self.targets: dict[str, dict[str, list[tuple[Task, Check]]]] = {}
+        for task in exam.tasks:
+            for check in task.checks:
+                host = exam.hosts.get(check.node)
+                if host is None:
+                    continue
+                home = "/root" if host.ssh_user == "root" else f"/home/{host.ssh_user}"
+                for path in check_paths(check, exam.working_dir, home):
+                    node_targets = self.targets.setdefault(check.node, {})
+                    node_targets.setdefault(path, []).append((task, check))
+        self._pending: dict[int, tuple[Task, Check]] = {}
+        self._changed = asyncio.Event()
+        self.passes = 0
+
+    @property
+    def check_count(self) -> int:
+        return len({
+            id(check)
+            for node_targets in self.targets.values()
+            for items in node_targets.values()
+            for _, check in items
+        })
+
+    def changed(self, node: str, paths: Iterable[str]) -> None:
+        """Queue the checks on ``node`` affected by changes at ``paths``."""
+        node_targets = self.targets.get(node, {})
+        for changed in paths:
+            if _IGNORED_RE.search(changed):
+                continue
+            for path, items in node_targets.items():
+                if affects(changed, path):
+                    for task, check in items:
+                        self._pending[id(check)] = (task, check)
+        if self._pending:
+            self._changed.set()
+
+    async def run(self) -> None:
+        await asyncio.gather(
+            self._dispatch(),
+            *(self._watch_node(node, sorted(paths)) for node, paths in self.targets.items()),
+        )
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_start = 0.0
+        while True:
+            await self._changed.wait()
+            # Let a burst of changes (a playbook run, a save) settle
+            deadline = loop.time() + MAX_DEBOUNCE
+            while True:
+                self._changed.clear()
+                timeout = min(DEBOUNCE, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            await asyncio.sleep(max(0.0, last_start + MIN_INTERVAL - loop.time()))
+            items, self._pending = list(self._pending.values()), {}
+            self._changed.clear()
+            last_start = loop.time()
+            self.passes += 1
+            await self.runner.verify_checks(items, self.on_result)
+
+    async def _watch_node(self, node: str, paths: list[str]) -> None:
+        host = self.runner.exam.hosts[node]
+        use_feed = True
+        catch_up = False
+        while True:
+            try:
+                if use_feed:
+                    rc, _ = await self.runner.pool.run_command(
+                        node, host.ip, "command -v inotifywait >/dev/null", host.ssh_user
+                    )
+                    use_feed = rc == 0
+                if catch_up:
+                    # Changes made while the feed was down went unseen
+                    self.changed(node, paths)
+                    catch_up = False
+                if use_feed:
+                    started = time.monotonic()
+                    if await self._follow(node, host.ip, host.ssh_user, paths):
+                        continue  # new directories to watch; restart at once
+                    use_feed = time.monotonic() - started >= _FEED_MIN_LIFETIME
+                    if not use_feed:
+                        continue
+                else:
+                    await self._poll(node, host.ip, host.ssh_user, paths)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            catch_up = True
+            await asyncio.sleep(RETRY_DELAY)
+
+    async def _follow(self, node: str, ip: str, user: str, paths: list[str]) -> bool:
+        """Stream inotify events until the feed ends. Returns True when a
+        directory appeared that the feed must be restarted to watch."""
+        async with self.runner.pool.open_process(node, ip, feed_script(paths), user) as process:
+            async for line in process.stdout:
+                events, _, changed = line.rstrip("\n").partition("|")
+                changed = posixpath.normpath(changed)
+                self.changed(node, [changed])
+                created_dir = "ISDIR" in events and ("CREATE" in events or "MOVED_TO" in events)
+                if created_dir or any(p.startswith(changed + "/") for p in paths):
+                    return True
+        return False
+
+    async def _poll(self, node: str, ip: str, user: str, paths: list[str]) -> None:
+        """Compare digests of every path each ``POLL_INTERVAL`` seconds."""
+        script = poll_script(paths)
+        previous: dict[str, str] | None = None
+        while True:
+            _, output = await self.runner.pool.run_command(node, ip, script, user)
+            digests = parse_stat_output(output)
+            if previous is not None:
+                self.changed(node, [p for p in paths if digests.get(p) != previous.get(p)])
+            previous = digests
+            await asyncio.sleep(POLL_INTERVAL)
@@ -5,10 +5,10 @@ from __future__ import annotations
 from rich.text import Text
 
 from textual.app import ComposeResult
-from textual.containers import VerticalScroll
+from textual.containers import Vertical, VerticalScroll
 from textual.widgets import RichLog, Static
 
-from ..models import CheckStatus, Exam, Task
+from ..models import Check, CheckResult, CheckStatus, Exam, Task
 
 _CHECK_ICONS = {
     CheckStatus.PENDING: "[dim]   [/]",
@@ -19,6 +19,33 @@ _CHECK_ICONS = {
 }
 
 
+def _check_label(check: Check, result: CheckResult) -> str:
+    icon = _CHECK_ICONS.get(result.status, "   ")
+    line = f"{icon} {check.description}"
+    if result.error_message and result.status in (
+        CheckStatus.FAILED, CheckStatus.ERROR
+    ):
+        line += f"\n       [dim]{result.error_message}[/]"
+    return line
+
+
+class CheckLine(Static):
+    """One check's line in the results list, re-rendered on its own."""
+
+    def __init__(self, check: Check, result: CheckResult, **kwargs) -> None:
+        self._label = _check_label(check, result)
+        super().__init__(self._label, markup=True, **kwargs)
+        self.check = check
+        self.result = result
+
+    def refresh_result(self) -> None:
+        """Re-render if the check's status or message changed."""
+        label = _check_label(self.check, self.result)
+        if label != self._label:
+            self._label = label
+            self.update(label)
+
+
 class TaskDetailWidget(VerticalScroll):
     """Shows the currently selected task's description and verification results."""
 
@@ -26,6 +53,7 @@ class TaskDetailWidget(VerticalScroll):
         super().__init__(**kwargs)
         self.exam = exam
         self._current_task_id: str | None = None
+        self._lines: dict[str, CheckLine] = {}
 
     def compose(self) -> ComposeResult:
         yield Static("", id="task-title", markup=True)
@@ -35,6 +63,8 @@ class TaskDetailWidget(VerticalScroll):
             id="results-header",
             markup=True,
         )
+        yield Vertical(id="results-list")
+        # Free-form output (e.g. the connectivity check); hidden until used
         yield RichLog(id="results-log", markup=True, wrap=True)
 
     def show_task(self, task_id: str) -> None:
@@ -57,25 +87,37 @@ class TaskDetailWidget(VerticalScroll):
 
     def refresh_current(self) -> None:
         """Re-render the current task's check results."""
-        if self._current_task_id:
-            task = self._find_task(self._current_task_id)
-            if task:
-                self._render_results(task)
+        for line in self._lines.values():
+            line.refresh_result()
+
+    def refresh_checks(self, task_id: str, check_ids: set[str]) -> None:
+        """Re-render only the given checks, if their task is on screen."""
+        if task_id != self._current_task_id:
+            return
+        for check_id in check_ids:
+            line = self._lines.get(check_id)
+            if line is not None:
+                line.refresh_result()
+
+    def show_log(self) -> RichLog:
+        """Clear, reveal and return the free-form output log."""
+        log = self.query_one("#results-log", RichLog)
+        log.clear()
+        log.display = True
+        return log
 
     def _render_results(self, task: Task) -> None:
         log = self.query_one("#results-log", RichLog)
         log.clear()
-        for check, result in zip(task.checks, task.results):
-            icon = _CHECK_ICONS.get(result.status, "   ")
-            line = f"{icon} {check.description}"
-            if result.error_message and result.status in (
-                CheckStatus.FAILED, CheckStatus.ERROR
-            ):
-                line += f"\n       [dim]{result.error_message}[/]"
-            log.write(line)
+        log.display = False
+        container = self.query_one("#results-list", Vertical)
+        container.remove_children()
+        self._lines = {
+            check.id: CheckLine(check, result)
+            for check, result in zip(task.checks, task.results)
+        }
+        if self._lines:
+            container.mount(*self._lines.values())
 
     def _find_task(self, task_id: str) -> Task | None:
-        for t in self.exam.tasks:
-            if t.id == task_id:
-                return t
-        return None
+        return self.exam.get_task(task_id)
@@ -24,18 +24,22 @@ class TaskListItem(ListItem):
         super().__init__(**kwargs)
         self.exam_task = task
         self.task_index = index
+        self._label = ""
 
-    def compose(self) -> ComposeResult:
+    def _make_label(self) -> str:
         icon = _STATUS_ICONS.get(self.exam_task.status, "   ")
-        label = f"{icon} {self.task_index + 1}. {self.exam_task.title}"
-        yield Static(label, markup=True)
+        return f"{icon} {self.task_index + 1}. {self.exam_task.title}"
+
+    def compose(self) -> ComposeResult:
+        self._label = self._make_label()
+        yield Static(self._label, markup=True)
 
     def refresh_status(self) -> None:
-        """Re-render the status icon."""
-        icon = _STATUS_ICONS.get(self.exam_task.status, "   ")
-        label = f"{icon} {self.task_index + 1}. {self.exam_task.title}"
-        static = self.query_one(Static)
-        static.update(label)
+        """Re-render the status icon if it changed."""
+        label = self._make_label()
+        if label != self._label:
+            self._label = label
+            self.query_one(Static).update(label)
 
 
 class TaskListWidget(ListView):
@@ -49,11 +53,14 @@ class TaskListWidget(ListView):
 
     def __init__(self, tasks: list[Task], **kwargs) -> None:
         self._tasks = tasks
+        self._items: dict[str, TaskListItem] = {}
         super().__init__(**kwargs)
 
     def compose(self) -> ComposeResult:
         for i, task in enumerate(self._tasks):
-            yield TaskListItem(task, i, id=f"task-item-{task.id}")
+            item = TaskListItem(task, i, id=f"task-item-{task.id}")
+            self._items[task.id] = item
+            yield item
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         item = event.item
@@ -62,5 +69,11 @@ class TaskListWidget(ListView):
 
     def refresh_statuses(self) -> None:
         """Re-render all task status icons."""
-        for item in self.query(TaskListItem):
+        for item in self._items.values():
+            item.refresh_status()
+
+    def refresh_task(self, task_id: str) -> None:
+        """Re-render one task's status icon."""
+        item = self._items.get(task_id)
+        if item is not None:
             item.refresh_status()
@@ -0,0 +1,42 @@
+"""Toggleable panel showing per-node check latency."""
+
+from __future__ import annotations
+
+from textual.widgets import Static
+
+from ..models import Exam
+from ..verification.timing import node_summary, slowest_checks
+
+
+class TimingPanel(Static):
+    """p50/p95 check time per node, plus the slowest checks."""
+
+    def __init__(self, exam: Exam, **kwargs) -> None:
+        super().__init__("", markup=True, **kwargs)
+        self.exam = exam
+
+    def refresh_timings(self) -> None:
+        """Recompute the table; skipped while the panel is hidden."""
+        if not self.display:
+            return
+        summary = node_summary(self.exam)
+        if not summary:
+            self.update("[dim]No timings yet — verify some tasks first.[/]")
+            return
+        lines = [
+            "[bold]Check timing (seconds)[/]",
+            f"  {'node':>10} {'checks':>6} {'p50':>6} {'p95':>6}   exec p50/p95",
+        ]
+        for node, s in summary.items():
+            lines.append(
+                f"  {node:>10} {s['checks']:>6} {s['p50']:>6.2f} {s['p95']:>6.2f}"
+                f"   {s['exec_p50']:.2f}/{s['exec_p95']:.2f}"
+            )
+        slow = slowest_checks(self.exam, limit=3)
+        if slow:
+            lines.append("[bold]Slowest[/]")
+            for check, result in slow:
+                lines.append(
+                    f"  {result.timing.total:6.2f}s  {check.node}  {check.description}"
+                )
+        self.update("\n".join(lines))